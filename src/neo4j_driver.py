@@ -1,4 +1,27 @@
+import logging
+from typing import List
+
 from neo4j import AsyncDriver, AsyncGraphDatabase
+from neo4j.exceptions import Neo4jError
+
+
+logger = logging.getLogger(__name__)
+
+# Entity ids are unique. The constraint is also what indexes :Entity(id), so
+# create_entities' MERGE and every lookup by id is a seek rather than a scan
+ENTITY_ID_CONSTRAINT = (
+    "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS "
+    "FOR (n:Entity) REQUIRE n.id IS UNIQUE"
+)
+
+# Fallback when the constraint can't be created: ids are still indexed, just
+# not guaranteed unique. It has to be dropped before the constraint can be
+# created on the same property.
+ENTITY_ID_INDEX = "CREATE INDEX entity_id IF NOT EXISTS FOR (n:Entity) ON (n.id)"
+DROP_ENTITY_ID_INDEX = "DROP INDEX entity_id IF EXISTS"
+
+# How many duplicated ids a warning lists
+MAX_REPORTED_DUPLICATES = 10
 
 
 async def create_neo4j_driver(
@@ -26,4 +49,75 @@ async def create_neo4j_driver(
     
     # Verify connectivity before returning
     await driver.verify_connectivity()
-    return driver 
\ No newline at end of file
+    return driver
+
+
+async def ensure_schema(driver: AsyncDriver) -> bool:
+    """Create the entity id uniqueness constraint, if it doesn't exist yet
+
+    This is best effort, so the server still starts when the constraint
+    can't be created, e.g. because entities created by older versions share
+    an id, or because the user may not change the schema. A warning then says
+    why, and a plain index on the id is created instead where possible.
+
+    Args:
+        driver: Neo4j async driver instance
+
+    Returns:
+        Whether the uniqueness constraint is in place
+    """
+    try:
+        await driver.execute_query(ENTITY_ID_CONSTRAINT)
+        return True
+    except Neo4jError as e:
+        error = e
+
+    duplicates = await _duplicate_entity_ids(driver)
+    if duplicates:
+        logger.warning(
+            "Entity ids are not unique, so the entity_id_unique constraint was "
+            "not created. Duplicated ids include: %s. See 'Removing duplicate "
+            "entity ids' in the README.",
+            ", ".join(str(entity_id) for entity_id in duplicates)
+        )
+    else:
+        try:
+            # A fallback index from an earlier start blocks the constraint
+            await driver.execute_query(DROP_ENTITY_ID_INDEX)
+            await driver.execute_query(ENTITY_ID_CONSTRAINT)
+            return True
+        except Neo4jError as e:
+            error = e
+        logger.warning(
+            "Could not create the entity_id_unique constraint, e.g. for lack "
+            "of schema privileges: %s",
+            error
+        )
+
+    try:
+        await driver.execute_query(ENTITY_ID_INDEX)
+    except Neo4jError as e:
+        logger.warning(
+            "Could not create the entity_id index either, so lookups by "
+            "entity id will scan every entity: %s",
+            e
+        )
+    return False
+
+
+async def _duplicate_entity_ids(driver: AsyncDriver) -> List[str]:
+    """Return some of the entity ids shared by more than one entity"""
+    query = """
+    MATCH (n:Entity)
+    WHERE n.id IS NOT NULL
+    WITH n.id as id, count(*) as copies
+    WHERE copies > 1
+    RETURN collect(id)[..$limit] as ids
+    """
+    try:
+        records, _, _ = await driver.execute_query(
+            query, {"limit": MAX_REPORTED_DUPLICATES}
+        )
+    except Neo4jError:
+        return []
+    return records[0]["ids"] if records else []
@@ -14,7 +14,7 @@ from tools.delete_entities import register as register_delete_entities
 from tools.introspect_schema import register as register_introspect_schema
 from tools.search_entities import register as register_search_entities
 from tools.update_entities import register as register_update_entities
-from neo4j_driver import create_neo4j_driver
+from neo4j_driver import create_neo4j_driver, ensure_schema
 
 # Load environment variables
 load_dotenv()
@@ -22,13 +22,15 @@ load_dotenv()
 
 @asynccontextmanager
 async def lifespan(mcp: FastMCP):
-    # Initialize Neo4j driver with docker-compose configuration
+    # Initialize Neo4j driver with docker-compose configuration; connectivity
+    # is verified once by create_neo4j_driver
     driver = await create_neo4j_driver()
 
     try:
-        # Verify connection
-        await driver.verify_connectivity()
-        
+        # Best effort: warns rather than fails if the id constraint can't be
+        # created, e.g. on a database that already holds duplicate ids
+        await ensure_schema(driver)
+
         # Register all tools
         await register_create_entities(mcp, driver)
         await register_create_relations(mcp, driver)
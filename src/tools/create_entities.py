@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncManagedTransaction, AsyncSession, AsyncTransaction
 from mcp.server.fastmcp import FastMCP
 
+from .introspect_schema import invalidate_schema_cache
+from .transactions import run_write
+
 
 @dataclass
 class Entity:
@@ -23,54 +26,78 @@ class CreateEntitiesResult:
     result: List[Entity]
 
 
-async def create_entities_impl(driver: AsyncDriver, entities: List[CreateEntityRequest]) -> CreateEntitiesResult:
+async def _create_entities(tx: AsyncManagedTransaction, rows: List[Dict]) -> List[Dict]:
+    """Create or merge the given entity rows within a managed transaction"""
+    # Entities with an id are merged on it so re-creating one is a no-op;
+    # entities without any id can't be merged and are always created
+    query = """
+    UNWIND $rows AS row
+    CALL {
+        WITH row
+        WITH row WHERE row.properties.id IS NOT NULL
+        MERGE (n:Entity {id: row.properties.id})
+        ON CREATE SET n = row.properties, n.type = row.type
+        RETURN n
+      UNION
+        WITH row
+        WITH row WHERE row.properties.id IS NULL
+        CREATE (n:Entity)
+        SET n = row.properties, n.type = row.type
+        RETURN n
+    }
+    CALL apoc.create.addLabels(n, [coalesce(n.type, row.type)]) YIELD node
+    RETURN {
+        id: node.id,
+        type: node.type,
+        properties: properties(node)
+    } as result
+    """
+
+    result = await tx.run(query, {"rows": rows})
+    return [record["result"] async for record in result]
+
+
+async def create_entities_impl(
+    driver: AsyncDriver,
+    entities: List[CreateEntityRequest],
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None
+) -> CreateEntitiesResult:
     """Create multiple new entities in the knowledge graph
     
     Args:
         driver: Neo4j async driver instance
         entities: List of entity requests with type and properties fields
+        tx: Optional transaction to run in instead of a new one; the caller
+            is responsible for committing or rolling it back
+        session: Optional session to run on instead of opening a new one
         
     Returns:
-        CreateEntitiesResult containing the created entities with their properties
+        CreateEntitiesResult containing the created entities with their properties.
+        Entities whose id already exists are returned as stored, not duplicated.
     """
-    results = []
-
-    async with driver.session() as session:
-        for entity in entities:
-            # Create node with entity type as label and all properties
-            query = """
-            CREATE (n:Entity)
-            SET n = $properties
-            SET n.type = $type
-            WITH n, $type as type
-            CALL apoc.create.addLabels(n, [type]) YIELD node
-            RETURN {
-                id: node.id,
-                type: node.type,
-                properties: properties(node)
-            } as result
-            """
-            
-            # Ensure id is set (use name if not provided)
-            properties = dict(entity.properties)
-            if "id" not in properties:
-                properties["id"] = properties.get("name")
-            
-            params = {
-                "properties": properties,
-                "type": entity.type
-            }
-
-            result = await session.run(query, params)
-            record = await result.single()
-            if record:
-                node_data = record["result"]
-                results.append(Entity(
-                    id=node_data["id"],
-                    type=node_data["type"],
-                    properties=node_data["properties"]
-                ))
+    rows = []
+    for entity in entities:
+        # Ensure id is set (use name if not provided)
+        properties = dict(entity.properties)
+        if "id" not in properties:
+            properties["id"] = properties.get("name")
+        rows.append({
+            "properties": properties,
+            "type": entity.type
+        })
+
+    records = await run_write(driver, _create_entities, rows, tx=tx, session=session)
 
+    results = [
+        Entity(
+            id=node_data["id"],
+            type=node_data["type"],
+            properties=node_data["properties"]
+        ) for node_data in records
+    ]
+
+    invalidate_schema_cache()
     return CreateEntitiesResult(result=results)
 
 
@@ -86,6 +113,9 @@ async def register(server: FastMCP, driver: AsyncDriver) -> None:
         - All provided properties
         - An ID field (either provided or derived from the name property)
         
+        Creation is idempotent: an entity whose ID already exists is returned
+        as stored instead of being created a second time.
+        
         Args:
             entities: List of entity dictionaries, each containing:
                 - type: String - The type of entity (e.g., Person, Organization)
@@ -103,7 +133,7 @@ async def register(server: FastMCP, driver: AsyncDriver) -> None:
                     
         Raises:
             ValueError: If required fields are missing or invalid
-            Neo4jError: If there are database errors (e.g., duplicate IDs)
+            Neo4jError: If there are database errors
         """
      
             
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncManagedTransaction, AsyncSession, AsyncTransaction
 from mcp.server.fastmcp import FastMCP
 
+from .introspect_schema import invalidate_schema_cache
+from .transactions import run_write
+
 
 @dataclass
 class Relation:
@@ -24,45 +27,60 @@ class CreateRelationsResult:
     result: List[Relation]
 
 
-async def create_relations_impl(driver: AsyncDriver, relations: List[CreateRelationRequest]) -> CreateRelationsResult:
+async def _create_relations(tx: AsyncManagedTransaction, rows: List[Dict]) -> List[Dict]:
+    """Create the given relations within a managed transaction"""
+    # Relationship types can't be parameterized in plain Cypher, so APOC is
+    # used to create them from a parameter, letting all rows share one query.
+    # Rows whose entities don't exist produce no match and are skipped.
+    query = """
+    UNWIND $relations AS relation
+    MATCH (a:Entity {id: relation.from_id}), (b:Entity {id: relation.to_id})
+    CALL apoc.create.relationship(a, relation.type, {}, b) YIELD rel
+    RETURN type(rel) as type, a.id as from_id, b.id as to_id
+    """
+    result = await tx.run(query, {"relations": rows})
+    return [record.data() async for record in result]
+
+
+async def create_relations_impl(
+    driver: AsyncDriver,
+    relations: List[CreateRelationRequest],
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None
+) -> CreateRelationsResult:
     """Create multiple new relations between entities in the knowledge graph
     
     Args:
         driver: Neo4j async driver instance
         relations: List of relation requests with from_id, to_id, and type fields
+        tx: Optional transaction to run in instead of a new one; the caller
+            is responsible for committing or rolling it back
+        session: Optional session to run on instead of opening a new one
         
     Returns:
         CreateRelationsResult containing the created relations
     """
-    results = []
-
-    async with driver.session() as session:
-        for relation in relations:
-            # We need to use string formatting for the relationship type
-            # as Neo4j doesn't support parameterized relationship types
-            query = f"""
-            MATCH (a:Entity {{id: $from_id}}), (b:Entity {{id: $to_id}})
-            CREATE (a)-[r:{relation.type}]->(b)
-            RETURN type(r) as type, a.id as from_id, b.id as to_id
-            """
-            params = {
-                "from_id": relation.from_id,
-                "to_id": relation.to_id
-            }
-
-            try:
-                result = await session.run(query, params)
-                record = await result.single()
-                if record:
-                    results.append(Relation(
-                        type=record["type"],
-                        from_id=record["from_id"],
-                        to_id=record["to_id"]
-                    ))
-            except Exception:
-                # If the query fails (e.g., entities not found), continue to next relation
-                continue
+    rows = [
+        {
+            "type": relation.type,
+            "from_id": relation.from_id,
+            "to_id": relation.to_id
+        }
+        # An empty type can never be created, skip it like a missing entity
+        for relation in relations if relation.type
+    ]
+
+    records = await run_write(driver, _create_relations, rows, tx=tx, session=session)
+
+    results = [
+        Relation(
+            type=record["type"],
+            from_id=record["from_id"],
+            to_id=record["to_id"]
+        ) for record in records
+    ]
 
+    invalidate_schema_cache()
     return CreateRelationsResult(result=results)
 
 
@@ -75,7 +93,7 @@ async def register(server: FastMCP, driver: AsyncDriver) -> None:
         
         Creates directed relationships between entities. Both source and target entities
         must exist in the database before creating the relationship. The relationship type
-        is used as-is (not parameterized) and will be the label of the relationship in Neo4j.
+        is used as-is and will be the label of the relationship in Neo4j.
         
         Args:
             relations: List of relation dictionaries, each containing:
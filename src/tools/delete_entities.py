@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
-from neo4j import AsyncDriver, AsyncSession
+from neo4j import AsyncDriver, AsyncManagedTransaction, AsyncSession, AsyncTransaction
 from mcp.server.fastmcp import FastMCP
 
+from .introspect_schema import invalidate_schema_cache
+from .transactions import run_read, run_write
+
 
 @dataclass
 class DeleteEntityRequest:
@@ -49,7 +52,9 @@ def _neo4j_to_entity(neo4j_entity: Dict) -> Entity:
 async def delete_entities_impl(
     driver: AsyncDriver,
     requests: List[DeleteEntityRequest],
-    dry_run: bool = False
+    dry_run: bool = False,
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None
 ) -> DeletionResult:
     """Delete entities from the graph with optional cascade deletion of relationships.
     
@@ -57,6 +62,9 @@ async def delete_entities_impl(
         driver: Neo4j async driver instance
         requests: List of DeleteEntityRequest objects specifying what to delete
         dry_run: If True, only return what would be deleted without making changes
+        tx: Optional transaction to run in instead of a new one; the caller
+            is responsible for committing or rolling it back
+        session: Optional session to run on instead of opening a new one
     
     Returns:
         DeletionResult containing:
@@ -67,125 +75,140 @@ async def delete_entities_impl(
         - impacted_entities: Optional list of entities that would be affected (dry_run only)
         - impacted_relationships: Optional list of relationships that would be affected (dry_run only)
     """
-    entity_ids = [r.id for r in requests]
-    cascade = any(r.cascade for r in requests)
+    entity_ids = list(dict.fromkeys(r.id for r in requests))
+    cascade_ids = {r.id for r in requests if r.cascade}
 
-    async with driver.session() as session:
-        # First get all affected entities and relationships
-        impact = await _analyze_deletion_impact(session, entity_ids)
-        
-        if dry_run:
-            return DeletionResult(
-                success=True,
-                deleted_entities=[],
-                deleted_relationships=[],
-                impacted_entities=[_neo4j_to_entity(e) for e in impact["entities"]],
-                impacted_relationships=impact["relations"]
-            )
-            
-        # If not cascading, check for orphaned relationships
-        if not cascade and impact["orphaned_relations"]:
-            return DeletionResult(
-                success=False,
-                deleted_entities=[],
-                deleted_relationships=[],
-                errors=["Cannot delete entities as it would create orphaned relationships. Use cascade=True to delete relationships as well."]
-            )
-            
-        # Perform the deletion
-        if cascade:
-            # Delete both entities and relationships
-            query = """
-            MATCH (n:Entity)
-            WHERE n.id IN $entity_ids
-            WITH n
-            OPTIONAL MATCH (n)-[r]-()
-            DELETE n, r
-            RETURN count(DISTINCT n) as deleted_entities, count(DISTINCT r) as deleted_relations
-            """
-        else:
-            # Delete only entities that have no relationships
-            query = """
-            MATCH (n:Entity)
-            WHERE n.id IN $entity_ids
-            AND NOT (n)-[]-()
-            DELETE n
-            RETURN count(n) as deleted_entities, 0 as deleted_relations
-            """
-            
-        result = await session.run(query, {"entity_ids": entity_ids})
-        stats = await result.single()
-        
-        # Handle case where no entities were found
-        if stats is None or stats["deleted_entities"] == 0:
-            return DeletionResult(
-                success=False,
-                deleted_entities=[],
-                deleted_relationships=[],
-                errors=["Entity not found"]
-            )
-            
+    # The impact check and the delete share one transaction, so nothing can
+    # change between validating the request and acting on it. A dry run
+    # never writes, so it only needs a read transaction
+    run = run_read if dry_run else run_write
+    result = await run(
+        driver, _delete_entities, entity_ids, cascade_ids, dry_run, tx=tx, session=session
+    )
+
+    if result.success and not dry_run:
+        invalidate_schema_cache()
+    return result
+
+
+async def _delete_entities(
+    tx: AsyncManagedTransaction,
+    entity_ids: List[str],
+    cascade_ids: Set[str],
+    dry_run: bool
+) -> DeletionResult:
+    """Check the impact of deleting the given entities and, unless this is a
+    dry run, delete them within a managed transaction
+
+    With dry_run set nothing is written, so tx may be a read transaction.
+    """
+    # First get all affected entities and relationships in one round-trip
+    impact = await _analyze_deletion_impact(tx, entity_ids)
+
+    if impact["missing_ids"]:
+        return DeletionResult(
+            success=False,
+            deleted_entities=[],
+            deleted_relationships=[],
+            errors=[f"Entities not found: {', '.join(impact['missing_ids'])}"]
+        )
+
+    if dry_run:
         return DeletionResult(
             success=True,
-            deleted_entities=[_neo4j_to_entity(e) for e in impact["entities"]],
-            deleted_relationships=impact["relations"] if cascade else []
+            deleted_entities=[],
+            deleted_relationships=[],
+            impacted_entities=[_neo4j_to_entity(e) for e in impact["entities"]],
+            impacted_relationships=impact["relations"]
+        )
+
+    # Entities deleted without cascade must not leave relationships dangling
+    # from entities that are being kept
+    deleted_ids = set(entity_ids)
+    orphaned_relations = [
+        rel for rel in impact["relations"]
+        if (rel["from"] in deleted_ids and rel["from"] not in cascade_ids and rel["to"] not in deleted_ids)
+        or (rel["to"] in deleted_ids and rel["to"] not in cascade_ids and rel["from"] not in deleted_ids)
+    ]
+    if orphaned_relations:
+        return DeletionResult(
+            success=False,
+            deleted_entities=[],
+            deleted_relationships=[],
+            errors=["Cannot delete entities as it would create orphaned relationships. Use cascade=True to delete relationships as well."]
         )
 
+    # Any relationship left at this point is either cascaded or runs
+    # between two deleted entities, so all of them go with their nodes
+    query = """
+    UNWIND $entity_ids AS entity_id
+    MATCH (n:Entity {id: entity_id})
+    DETACH DELETE n
+    """
+    result = await tx.run(query, {"entity_ids": entity_ids})
+    await result.consume()
+
+    return DeletionResult(
+        success=True,
+        deleted_entities=[_neo4j_to_entity(e) for e in impact["entities"]],
+        deleted_relationships=impact["relations"]
+    )
+
 
 async def _analyze_deletion_impact(
-    session: AsyncSession,
+    tx: AsyncManagedTransaction,
     entity_ids: List[str]
 ) -> Dict:
     """Analyze what would be affected by deleting the specified entities.
     
     Args:
-        session: Neo4j async session
+        tx: Neo4j managed transaction
         entity_ids: List of entity IDs to analyze
         
     Returns:
-        Dict containing affected entities and relationships
+        Dict containing affected entities and relationships, and the IDs
+        that don't match any entity
     """
-    # Get entities and their relationships
+    # One row per requested id, with null entity when it doesn't exist
     query = """
-    MATCH (n:Entity)
-    WHERE n.id IN $entity_ids
+    UNWIND $entity_ids AS entity_id
+    OPTIONAL MATCH (n:Entity {id: entity_id})
     OPTIONAL MATCH (n)-[r]-()
-    RETURN 
-        collect(DISTINCT {
+    WITH entity_id, n, collect(DISTINCT r) as rels
+    RETURN
+        entity_id,
+        CASE WHEN n IS NULL THEN null ELSE {
             id: n.id,
             type: labels(n),
             properties: properties(n)
-        }) as entities,
-        collect(DISTINCT {
+        } END as entity,
+        [r IN rels | {
+            element_id: elementId(r),
             type: type(r),
             from: startNode(r).id,
             to: endNode(r).id,
             properties: properties(r)
-        }) as relations
+        }] as relations
     """
     
-    result = await session.run(query, {"entity_ids": entity_ids})
-    record = await result.single()
-    
-    if not record:
-        return {"entities": [], "relations": [], "orphaned_relations": []}
-        
-    entities = record["entities"]
-    relations = record["relations"]
-    
-    # Filter out None from relations (when there are no relationships)
-    relations = [r for r in relations if r is not None]
-    
-    # Identify orphaned relationships (those where only one end is being deleted)
-    orphaned_relations = []
-    for rel in relations:
-        if (rel["from"] in entity_ids) != (rel["to"] in entity_ids):
-            orphaned_relations.append(rel)
-            
+    result = await tx.run(query, {"entity_ids": entity_ids})
+
+    entities = []
+    found_ids = set()
+    # Relationships between two requested entities are reported once
+    relations = {}
+    async for record in result:
+        if record["entity"] is None:
+            continue
+        found_ids.add(record["entity_id"])
+        entities.append(record["entity"])
+        for rel in record["relations"]:
+            relations[rel.pop("element_id")] = rel
+
     return {
         "entities": entities,
-        "relations": relations,
-        "orphaned_relations": orphaned_relations
+        "relations": list(relations.values()),
+        "missing_ids": [entity_id for entity_id in entity_ids if entity_id not in found_ids]
     }
 
 
@@ -244,7 +267,8 @@ async def register(server: FastMCP, driver: AsyncDriver) -> None:
             
         Notes:
             - All specified entities must exist
-            - Without cascade=True, all entities must have no relationships
+            - Without cascade=True, entities may only have relationships to other
+              entities being deleted in the same request
             - With cascade=True, all connected relationships will be deleted
             - dry_run=True allows safely checking the impact before deletion
             - The operation is atomic - either all specified entities are deleted
@@ -1,9 +1,13 @@
+import asyncio
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Optional, Tuple
 
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncManagedTransaction, Record
 from mcp.server.fastmcp import FastMCP
 
+from .transactions import open_session
+
 
 @dataclass
 class SchemaLabel:
@@ -28,69 +32,234 @@ class SchemaIntrospectionResult:
     relationship_properties: Dict[str, List[str]]
 
 
-async def introspect_schema_impl(driver: AsyncDriver) -> SchemaIntrospectionResult:
+# Cached introspection results keyed by (id(driver), use_schema_procedures),
+# each stored with the fingerprint of the graph it was computed from and the
+# time.monotonic() at which it was computed
+_schema_cache: Dict[
+    Tuple[int, bool], Tuple[Tuple[Hashable, ...], float, SchemaIntrospectionResult]
+] = {}
+_schema_cache_lock = asyncio.Lock()
+
+# Bumped by every tool that writes to the graph, so label or property changes
+# that leave node and relationship counts untouched still invalidate the cache
+_schema_generation = 0
+
+# Seconds a cached schema is trusted. Writes from outside this process (other
+# servers, Neo4j Browser) that only put an existing property key or label on
+# other nodes leave the fingerprint unchanged, so entries also expire.
+SCHEMA_CACHE_TTL = 30.0
+
+
+def invalidate_schema_cache() -> None:
+    """Mark all cached schemas as stale after a write to the graph"""
+    global _schema_generation
+    _schema_generation += 1
+
+
+async def _schema_fingerprint(driver: AsyncDriver) -> Tuple[Hashable, ...]:
+    """Cheaply identify the current state of the graph
+
+    Counts are served from Neo4j's count store and the label, relationship
+    type and property key names from its token store, so this is a single
+    query rather than a scan. Along with the write generation, it catches
+    new names and added or removed nodes and relationships from any client.
+    """
+    generation = _schema_generation
+    query = """
+    CALL { MATCH (n) RETURN count(n) as node_count }
+    CALL { MATCH ()-[r]->() RETURN count(r) as rel_count }
+    CALL { CALL db.labels() YIELD label RETURN collect(label) as labels }
+    CALL {
+        CALL db.relationshipTypes() YIELD relationshipType
+        RETURN collect(relationshipType) as relationship_types
+    }
+    CALL {
+        CALL db.propertyKeys() YIELD propertyKey
+        RETURN collect(propertyKey) as property_keys
+    }
+    RETURN node_count, rel_count, labels, relationship_types, property_keys
+    """
+    async with open_session(driver) as session:
+        records = await session.execute_read(_read_records, query)
+    record = records[0]
+    return (
+        generation,
+        record["node_count"],
+        record["rel_count"],
+        frozenset(record["labels"]),
+        frozenset(record["relationship_types"]),
+        frozenset(record["property_keys"])
+    )
+
+
+async def introspect_schema_impl(
+    driver: AsyncDriver,
+    use_schema_procedures: bool = True
+) -> SchemaIntrospectionResult:
     """Introspect the Neo4j database schema to get information about node labels and relationship types
     
+    Results are cached per driver and reused until the graph's fingerprint
+    changes or SCHEMA_CACHE_TTL seconds pass, whichever comes first.
+    
     Args:
         driver: Neo4j async driver instance
+        use_schema_procedures: If True, read property keys from the built-in
+            db.schema.* procedures in a single statement. If False, fall back
+            to one scanning query per label and relationship type, which
+            doesn't depend on the procedures. Both read the whole graph
         
     Returns:
         SchemaIntrospectionResult containing schema information including node labels, relationship types,
         and their respective properties
     """
-    schema_info = {
-        "node_labels": [],
-        "relationship_types": [],
-        "node_properties": {},
-        "relationship_properties": {},
+    async with _schema_cache_lock:
+        fingerprint = await _schema_fingerprint(driver)
+        cache_key = (id(driver), use_schema_procedures)
+        cached = _schema_cache.get(cache_key)
+        now = time.monotonic()
+        if cached and cached[0] == fingerprint and now - cached[1] < SCHEMA_CACHE_TTL:
+            return cached[2]
+
+        result = await _introspect_schema(driver, use_schema_procedures)
+        _schema_cache[cache_key] = (fingerprint, now, result)
+        return result
+
+
+def _unquote_rel_type(rel_type: str) -> str:
+    """Convert a relationship type as reported by db.schema.relTypeProperties,
+    e.g. ":`WORKS_AT`", back to its plain name"""
+    rel_type = rel_type.lstrip(":")
+    if rel_type.startswith("`") and rel_type.endswith("`"):
+        rel_type = rel_type[1:-1].replace("``", "`")
+    return rel_type
+
+
+async def _read_records(tx: AsyncManagedTransaction, query: str) -> List[Record]:
+    """Run a read-only query within a managed transaction and collect its records"""
+    result = await tx.run(query)
+    return [record async for record in result]
+
+
+async def _fetch_labels(driver: AsyncDriver) -> List[str]:
+    """Get all node labels"""
+    async with open_session(driver) as session:
+        records = await session.execute_read(
+            _read_records, "CALL db.labels() YIELD label RETURN label"
+        )
+    return [record["label"] for record in records]
+
+
+async def _fetch_relationship_types(driver: AsyncDriver) -> List[str]:
+    """Get all relationship types"""
+    async with open_session(driver) as session:
+        query = "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+        records = await session.execute_read(_read_records, query)
+    return [record["relationshipType"] for record in records]
+
+
+async def _fetch_schema(driver: AsyncDriver) -> Record:
+    """Get labels, relationship types and their property keys in a single
+    statement
+
+    The schema procedures still read every node and relationship to find the
+    property keys, so this is no cheaper per element than the scanning
+    fallback. It saves running one query per label and relationship type.
+    Either way the cost grows with the graph, which is why results are cached.
+    """
+    query = """
+    CALL { CALL db.labels() YIELD label RETURN collect(label) as node_labels }
+    CALL {
+        CALL db.relationshipTypes() YIELD relationshipType
+        RETURN collect(relationshipType) as relationship_types
     }
+    CALL {
+        CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+        UNWIND nodeLabels as label
+        WITH label, collect(DISTINCT propertyName) as properties
+        RETURN collect({label: label, properties: properties}) as node_properties
+    }
+    CALL {
+        CALL db.schema.relTypeProperties() YIELD relType, propertyName
+        WITH relType, collect(DISTINCT propertyName) as properties
+        RETURN collect({rel_type: relType, properties: properties}) as relationship_properties
+    }
+    RETURN node_labels, relationship_types, node_properties, relationship_properties
+    """
+    async with open_session(driver) as session:
+        records = await session.execute_read(_read_records, query)
+    return records[0]
 
-    async with driver.session() as session:
-        # Get all node labels
-        labels_query = "CALL db.labels() YIELD label RETURN label"
-        labels_result = await session.run(labels_query)
-        schema_info["node_labels"] = [
-            record["label"] async for record in labels_result
-        ]
-
-        # Get all relationship types
-        rel_types_query = "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
-        rel_types_result = await session.run(rel_types_query)
-        schema_info["relationship_types"] = [
-            record["relationshipType"] async for record in rel_types_result
-        ]
-
-        # Get property keys for each node label
-        for label in schema_info["node_labels"]:
+
+async def _scan_node_properties(driver: AsyncDriver, labels: List[str]) -> Dict[str, List[str]]:
+    """Get property keys for each node label by scanning its nodes"""
+    node_properties = {}
+    async with open_session(driver) as session:
+        for label in labels:
             props_query = f"""
             MATCH (n:{label})
             UNWIND keys(n) as prop
             WITH DISTINCT prop
             RETURN collect(prop) as properties
             """
-            props_result = await session.run(props_query)
-            record = await props_result.single()
-            if record:
-                schema_info["node_properties"][label] = record["properties"]
+            records = await session.execute_read(_read_records, props_query)
+            if records:
+                node_properties[label] = records[0]["properties"]
+    return node_properties
+
 
-        # Get property keys for each relationship type
-        for rel_type in schema_info["relationship_types"]:
+async def _scan_relationship_properties(driver: AsyncDriver, rel_types: List[str]) -> Dict[str, List[str]]:
+    """Get property keys for each relationship type by scanning its relationships"""
+    relationship_properties = {}
+    async with open_session(driver) as session:
+        for rel_type in rel_types:
             props_query = f"""
             MATCH ()-[r:{rel_type}]->()
             UNWIND keys(r) as prop
             WITH DISTINCT prop
             RETURN collect(prop) as properties
             """
-            props_result = await session.run(props_query)
-            record = await props_result.single()
-            if record:
-                schema_info["relationship_properties"][rel_type] = record["properties"]
+            records = await session.execute_read(_read_records, props_query)
+            if records:
+                relationship_properties[rel_type] = records[0]["properties"]
+    return relationship_properties
+
+
+async def _introspect_schema(
+    driver: AsyncDriver,
+    use_schema_procedures: bool
+) -> SchemaIntrospectionResult:
+    """Run the full schema introspection queries against the database
+
+    With the schema procedures everything comes back from one statement. The
+    scanning fallback's queries are independent, so each runs on its own
+    session (sessions aren't concurrency-safe) and they are awaited together.
+    """
+    if use_schema_procedures:
+        record = await _fetch_schema(driver)
+        node_labels = record["node_labels"]
+        relationship_types = record["relationship_types"]
+        # Every label and type gets an entry, even when it has no properties
+        node_properties = {label: [] for label in node_labels}
+        for row in record["node_properties"]:
+            node_properties[row["label"]] = row["properties"]
+        relationship_properties = {rel_type: [] for rel_type in relationship_types}
+        for row in record["relationship_properties"]:
+            relationship_properties[_unquote_rel_type(row["rel_type"])] = row["properties"]
+    else:
+        node_labels, relationship_types = await asyncio.gather(
+            _fetch_labels(driver),
+            _fetch_relationship_types(driver)
+        )
+        node_properties, relationship_properties = await asyncio.gather(
+            _scan_node_properties(driver, node_labels),
+            _scan_relationship_properties(driver, relationship_types)
+        )
 
     return SchemaIntrospectionResult(
-        node_labels=schema_info["node_labels"],
-        relationship_types=schema_info["relationship_types"],
-        node_properties=schema_info["node_properties"],
-        relationship_properties=schema_info["relationship_properties"]
+        node_labels=node_labels,
+        relationship_types=relationship_types,
+        node_properties=node_properties,
+        relationship_properties=relationship_properties
     )
 
 
@@ -133,6 +302,9 @@ async def register(server: FastMCP, driver: AsyncDriver) -> None:
               label/type (not all instances will have all properties)
             - Empty labels/types (with no instances) are not included
             - System properties (starting with '_') are excluded
+            - Results are cached. Changes made through this server show up at
+              once; changes made by other clients that only reuse existing
+              labels or property keys may take up to 30 seconds to appear
         """
         if "driver" not in server.state:
             raise ValueError("Neo4j driver not found in server state")
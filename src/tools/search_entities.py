@@ -1,8 +1,11 @@
-from typing import Any, Dict, List, Optional
-from neo4j import AsyncDriver
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from neo4j import AsyncDriver, AsyncManagedTransaction, AsyncSession, AsyncTransaction, Bookmarks
 from dataclasses import dataclass
 from mcp.server.fastmcp import FastMCP
 
+from .transactions import run_read
+
 
 @dataclass
 class SearchEntityRequest:
@@ -29,107 +32,156 @@ class SearchEntitiesResult:
     results: List[Entity]
 
 
-async def search_entities_impl(driver: AsyncDriver, search_request: SearchEntityRequest) -> SearchEntitiesResult:
+async def _run_search(tx: AsyncManagedTransaction, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run a search query within a managed read transaction"""
+    result = await tx.run(query, params)
+    return [record.data() async for record in result]
+
+
+@lru_cache(maxsize=128)
+def _build_query(
+    entity_type: Optional[str],
+    properties: Tuple[str, ...],
+    has_search_term: bool,
+    word_count: int,
+    fuzzy_match: bool,
+    include_relationships: bool
+) -> str:
+    """Build the search query for one shape of request
+
+    Search values are always bound as parameters, so every request of the same
+    shape reuses one query string, and with it Neo4j's cached plan.
+    """
+    where_clauses = []
+    
+    # Add type filter if specified
+    type_match = "Entity"
+    if entity_type:
+        type_match += f":{entity_type}"
+        
+    # Filter by specified properties if provided, even without search term
+    if properties:
+        # If we have properties but no search term, just check property existence
+        if not has_search_term:
+            property_clauses = [f"n.{prop} IS NOT NULL" for prop in properties]
+            where_clauses.append(f"({' OR '.join(property_clauses)})")
+        else:
+            # If we have both properties and search term, do text matching
+            property_clauses = []
+            for prop in properties:
+                if fuzzy_match:
+                    # For each property, check if at least one word matches
+                    if word_count:
+                        property_clauses.append(
+                            f"({' OR '.join([f'toLower(toString(n.{prop})) CONTAINS $word_{i}' for i in range(word_count)])})"
+                        )
+                else:
+                    property_clauses.append(f"n.{prop} = $search_term")
+            if property_clauses:
+                where_clauses.append(f"({' OR '.join(property_clauses)})")
+    # If we have search term but no properties specified
+    elif has_search_term:
+        # Search all string properties with fuzzy matching. A substring test
+        # on a lowered term is cheaper than a regex, and the term can't be
+        # misread as a pattern (e.g. the "." in an email address)
+        if fuzzy_match:
+            where_clauses.append(
+                "ANY (prop IN keys(n) WHERE n[prop] IS :: STRING "
+                "AND toLower(n[prop]) CONTAINS $search_term_lower)"
+            )
+        else:
+            where_clauses.append("ANY (prop IN keys(n) WHERE n[prop] = $search_term)")
+
+    # Construct the full query
+    query = f"""
+    MATCH (n:{type_match})
+    """
+    
+    if where_clauses:
+        query += f"WHERE {' AND '.join(where_clauses)}\n"
+
+    query += """
+    RETURN {
+        id: n.id,
+        type: labels(n),
+        properties: properties(n)
+    } as node
+    """
+    
+    # Optionally include relationships, expanded per node by a pattern
+    # comprehension in the same query. Unlike OPTIONAL MATCH + collect, a node
+    # without relationships gets an empty list rather than one null entry
+    if include_relationships:
+        query += """,
+    [(n)-[r]-(related) | {
+        type: type(r),
+        direction: CASE WHEN startNode(r) = n THEN 'outgoing' ELSE 'incoming' END,
+        node: {id: related.id, type: labels(related)[0], properties: properties(related)}
+    }] as relationships
+    """
+
+    return query
+
+
+async def search_entities_impl(
+    driver: AsyncDriver,
+    search_request: SearchEntityRequest,
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None,
+    bookmarks: Optional[Bookmarks] = None
+) -> SearchEntitiesResult:
     """Search for entities in the knowledge graph with fuzzy matching support
     
     Args:
         driver: Neo4j async driver instance
         search_request: Search parameters including query and filters
+        tx: Optional transaction to search in instead of a new one, which
+            also sees that transaction's uncommitted writes
+        session: Optional session to run on instead of opening a new one
+        bookmarks: Optional bookmarks of earlier writes the search must see
         
     Returns:
         SearchEntitiesResult containing matching entities
     """
     results = []
 
-    async with driver.session() as session:
-        # Build the query dynamically based on parameters
-        where_clauses = []
-        params = {}
-        
-        # Add type filter if specified
-        type_match = "Entity"
-        if search_request.entity_type:
-            type_match += f":{search_request.entity_type}"
-            
-        # Filter by specified properties if provided, even without search term
-        if search_request.properties:
-            # If we have properties but no search term, just check property existence
-            if not search_request.search_term:
-                property_clauses = [f"n.{prop} IS NOT NULL" for prop in search_request.properties]
-                where_clauses.append(f"({' OR '.join(property_clauses)})")
-            else:
-                # If we have both properties and search term, do text matching
-                property_clauses = []
-                words = search_request.search_term.split()
-                for prop in search_request.properties:
-                    if search_request.fuzzy_match:
-                        # For each property, check if at least one word matches
-                        property_clauses.append(
-                            f"({' OR '.join([f'toLower(toString(n.{prop})) CONTAINS toLower($word_{i})' for i, _ in enumerate(words)])})"
-                        )
-                        # Add each word as a parameter
-                        for i, word in enumerate(words):
-                            params[f"word_{i}"] = word
-                    else:
-                        property_clauses.append(f"n.{prop} = '{search_request.search_term}'")
-                if property_clauses:
-                    where_clauses.append(f"({' OR '.join(property_clauses)})")
-        # If we have search term but no properties specified
-        elif search_request.search_term:
-            params["search_term"] = search_request.search_term
-            # Search all string properties with fuzzy matching
-            if search_request.fuzzy_match:
-                where_clauses.append("ANY (prop IN keys(n) WHERE n[prop] =~ $fuzzy_pattern)")
-                params["fuzzy_pattern"] = f"(?i).*{search_request.search_term}.*"
-            else:
-                where_clauses.append("ANY (prop IN keys(n) WHERE n[prop] = $search_term)")
-
-        # Construct the full query
-        query = f"""
-        MATCH (n:{type_match})
-        """
-        
-        if where_clauses:
-            query += f"WHERE {' AND '.join(where_clauses)}\n"
-
-        # Optionally include relationships
-        if search_request.include_relationships:
-            query += """
-            OPTIONAL MATCH (n)-[r]-(related)
-            WITH n, collect({type: type(r), direction: CASE WHEN startNode(r) = n THEN 'outgoing' ELSE 'incoming' END, 
-                           node: {id: related.id, type: labels(related)[0], properties: properties(related)}}) as rels
-            """
-        
-        query += """
-        RETURN {
-            id: n.id,
-            type: labels(n),
-            properties: properties(n)
-        } as node
-        """
-        
-        if search_request.include_relationships:
-            query += ", rels as relationships"
+    search_term = search_request.search_term
+    words = search_term.split() if search_term else []
+    query = _build_query(
+        search_request.entity_type,
+        tuple(search_request.properties or ()),
+        bool(search_term),
+        len(words),
+        search_request.fuzzy_match,
+        search_request.include_relationships
+    )
 
-        # Debug logging
-        print(f"Query: {query}")
-        print(f"Params: {params}")
+    params = {}
+    if search_term:
+        params["search_term"] = search_term
+        # Lowered once here rather than by toLower() for every node compared
+        params["search_term_lower"] = search_term.lower()
+        for i, word in enumerate(words):
+            params[f"word_{i}"] = word.lower()
 
-        # Execute query
-        result = await session.run(query, params)
+    # Execute query
+    records = await run_read(
+        driver, _run_search, query, params,
+        tx=tx, session=session, bookmarks=bookmarks
+    )
+    
+    for record in records:
+        node_data = record["node"]
+        if search_request.include_relationships:
+            node_data["relationships"] = record["relationships"]
         
-        async for record in result:
-            node_data = record["node"]
-            if search_request.include_relationships:
-                node_data["relationships"] = record["relationships"]
-            
-            # Convert to Entity dataclass
-            results.append(Entity(
-                id=node_data["id"],
-                type=node_data["type"],
-                properties=node_data["properties"],
-                relationships=node_data.get("relationships")
-            ))
+        # Convert to Entity dataclass
+        results.append(Entity(
+            id=node_data["id"],
+            type=node_data["type"],
+            properties=node_data["properties"],
+            relationships=node_data.get("relationships")
+        ))
 
     return SearchEntitiesResult(results=results)
 
@@ -0,0 +1,64 @@
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from neo4j import AsyncDriver, AsyncSession, AsyncTransaction, Bookmarks
+
+
+T = TypeVar("T")
+
+
+def open_session(driver: AsyncDriver, bookmarks: Optional[Bookmarks] = None) -> AsyncSession:
+    """Open a session that is causally chained to earlier work on driver
+
+    Every session shares the driver's bookmark manager, so in a cluster a
+    read can't be routed to a member that hasn't applied a write made by an
+    earlier tool call, e.g. updating an entity right after creating it.
+    """
+    return driver.session(
+        bookmark_manager=driver.execute_query_bookmark_manager,
+        bookmarks=bookmarks
+    )
+
+
+async def run_write(
+    driver: AsyncDriver,
+    work: Callable[..., Awaitable[T]],
+    *args: Any,
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None
+) -> T:
+    """Run a transaction function in a managed write transaction
+
+    If tx is given, the work runs inside that caller-owned transaction
+    instead, leaving its commit or rollback to the caller. If session is
+    given, the managed transaction runs on it rather than on a new session.
+    """
+    if tx is not None:
+        return await work(tx, *args)
+    if session is not None:
+        return await session.execute_write(work, *args)
+    async with open_session(driver) as session:
+        return await session.execute_write(work, *args)
+
+
+async def run_read(
+    driver: AsyncDriver,
+    work: Callable[..., Awaitable[T]],
+    *args: Any,
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None,
+    bookmarks: Optional[Bookmarks] = None
+) -> T:
+    """Run a transaction function in a managed read transaction
+
+    tx and session behave as for run_write. A caller-owned tx may be a write
+    transaction, in which case the work also sees its uncommitted changes.
+    bookmarks from an earlier write make a new session wait until the server
+    it reads from has caught up with that write, on top of the writes made
+    through open_session.
+    """
+    if tx is not None:
+        return await work(tx, *args)
+    if session is not None:
+        return await session.execute_read(work, *args)
+    async with open_session(driver, bookmarks) as session:
+        return await session.execute_read(work, *args)
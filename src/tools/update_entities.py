@@ -1,10 +1,13 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Union
 
-from neo4j import AsyncDriver, AsyncSession
+from neo4j import AsyncDriver, AsyncManagedTransaction, AsyncSession, AsyncTransaction
 from mcp.server.fastmcp import FastMCP
 
 from .delete_entities import _neo4j_to_entity, Entity
+from .introspect_schema import invalidate_schema_cache
+from .transactions import open_session, run_read, run_write
 
 
 @dataclass
@@ -25,13 +28,19 @@ class UpdateEntitiesResult:
 
 async def update_entities_impl(
     driver: AsyncDriver,
-    requests: List[UpdateEntityRequest]
+    requests: List[UpdateEntityRequest],
+    tx: Optional[AsyncTransaction] = None,
+    session: Optional[AsyncSession] = None
 ) -> UpdateEntitiesResult:
     """Update entities in the graph.
     
     Args:
         driver: Neo4j async driver instance
         requests: List of UpdateEntityRequest objects specifying what to update
+        tx: Optional transaction to run the updates in, left for the caller
+            to commit or roll back. A failed update then aborts the whole
+            transaction rather than just its own entity
+        session: Optional session to run on instead of opening a new one
     
     Returns:
         UpdateEntitiesResult containing:
@@ -39,17 +48,12 @@ async def update_entities_impl(
         - updated_entities: List of entities after updates
         - errors: Optional list of error messages if any updates failed
     """
-    async with driver.session() as session:
+    # A caller's session or transaction is used as is and left open for them
+    owns_session = session is None and tx is None
+    async with open_session(driver) if owns_session else nullcontext(session) as session:
         # First verify all entities exist
         entity_ids = [r.id for r in requests]
-        query = """
-        MATCH (n:Entity)
-        WHERE n.id IN $entity_ids
-        RETURN collect(n.id) as found_ids
-        """
-        result = await session.run(query, {"entity_ids": entity_ids})
-        record = await result.single()
-        found_ids = record["found_ids"] if record else []
+        found_ids = await run_read(driver, _find_entity_ids, entity_ids, tx=tx, session=session)
         
         missing_ids = set(entity_ids) - set(found_ids)
         if missing_ids:
@@ -107,15 +111,17 @@ async def update_entities_impl(
                 """)
                 
                 query = "\n".join(query_parts)
-                result = await session.run(query, params)
-                record = await result.single()
+                # Each update gets its own transaction so one failure
+                # doesn't roll back the others
+                entity = await run_write(driver, _update_entity, query, params, tx=tx, session=session)
                 
-                if record:
-                    updated_entities.append(_neo4j_to_entity(record["entity"]))
+                if entity:
+                    updated_entities.append(_neo4j_to_entity(entity))
                 
             except Exception as e:
                 errors.append(f"Failed to update entity {request.id}: {str(e)}")
         
+        invalidate_schema_cache()
         return UpdateEntitiesResult(
             success=len(errors) == 0,
             updated_entities=updated_entities,
@@ -123,6 +129,25 @@ async def update_entities_impl(
         )
 
 
+async def _find_entity_ids(tx: AsyncManagedTransaction, entity_ids: List[str]) -> List[str]:
+    """Return which of the given entity IDs exist in the graph"""
+    query = """
+    MATCH (n:Entity)
+    WHERE n.id IN $entity_ids
+    RETURN collect(n.id) as found_ids
+    """
+    result = await tx.run(query, {"entity_ids": entity_ids})
+    record = await result.single()
+    return record["found_ids"] if record else []
+
+
+async def _update_entity(tx: AsyncManagedTransaction, query: str, params: Dict) -> Optional[Dict]:
+    """Run a single entity update query and return the updated entity"""
+    result = await tx.run(query, params)
+    record = await result.single()
+    return record["entity"] if record else None
+
+
 async def register(server: FastMCP, driver: AsyncDriver) -> None:
     """Register the update_entities tool with the MCP server."""
     
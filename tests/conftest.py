@@ -8,6 +8,10 @@ def pytest_configure(config):
         "markers",
         "integration: mark test as an integration test"
     )
+    config.addinivalue_line(
+        "markers",
+        "unit: mark test as able to run against a stub driver, without Neo4j"
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,203 @@
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from neo4j import AsyncDriver, AsyncTransaction
+
+from src.tools.create_entities import create_entities_impl, CreateEntityRequest, Entity
+from src.tools.create_relations import create_relations_impl, CreateRelationRequest, Relation
+
+from _ids import tid
+
+
+@dataclass
+class SeededGraph:
+    """The standard test dataset as seeded, so tests needing one of its
+    entities can use it directly instead of searching for it
+
+    The data only exists inside tx, which tests must pass to the tools.
+    """
+    test_id: str
+    john: Entity
+    jane: Entity
+    corp: Entity
+    project: Entity
+    relations: List[Relation]
+    tx: AsyncTransaction
+
+
+# Entities seeded by create_test_dataset, with {id} standing in for the test_id
+DATASET_TEMPLATE: Tuple[CreateEntityRequest, ...] = (
+    CreateEntityRequest(
+        type="Person",
+        properties={
+            "name": "John Smith_{id}",
+            "age": 30,
+            "email": "john_{id}@example.com"
+        }
+    ),
+    CreateEntityRequest(
+        type="Person",
+        properties={
+            "name": "Jane Smith_{id}",
+            "age": 28,
+            "email": "jane_{id}@example.com"
+        }
+    ),
+    CreateEntityRequest(
+        type="Company",
+        properties={
+            "name": "Tech Corp_{id}",
+            "industry": "Technology"
+        }
+    ),
+    CreateEntityRequest(
+        type="Project",
+        properties={
+            "name": "Project Alpha_{id}",
+            "status": "Active"
+        }
+    )
+)
+
+# Relations seeded by create_test_dataset, as (type, from, to) positions in
+# DATASET_TEMPLATE, since the entity ids are only known once they're created
+RELATION_TEMPLATE: Tuple[Tuple[str, int, int], ...] = (
+    ("WORKS_AT", 0, 2),  # John -> Tech Corp
+    ("WORKS_AT", 1, 2),  # Jane -> Tech Corp
+    ("MANAGES", 0, 3),   # John -> Project Alpha
+)
+
+
+def make_dataset(test_id: str) -> List[CreateEntityRequest]:
+    """Build the dataset's entity requests for the given test_id"""
+    return [
+        replace(template, properties={
+            key: value.format(id=test_id) if isinstance(value, str) else value
+            for key, value in template.properties.items()
+        })
+        for template in DATASET_TEMPLATE
+    ]
+
+
+async def create_test_dataset(
+    driver: AsyncDriver,
+    test_id: str,
+    tx: Optional[AsyncTransaction] = None
+) -> Dict[str, List]:
+    """Create a test dataset with various entities and relationships
+
+    Args:
+        driver: Neo4j async driver instance
+        test_id: Unique identifier for this test to ensure data isolation
+        tx: Optional transaction to create the dataset in, e.g. one that is
+            rolled back after the test
+
+    Returns:
+        Dict containing:
+        - entities: List[Entity] - The created entities
+        - relations: List[Relation] - The created relationships
+    """
+    if tx is not None:
+        return await _seed_dataset(driver, test_id, tx)
+
+    # Entities and relations are each a single UNWIND query; running both in
+    # one transaction also saves a commit round-trip
+    async with driver.session() as session:
+        return await session.execute_write(
+            lambda tx: _seed_dataset(driver, test_id, tx)
+        )
+
+
+async def _seed_dataset(
+    driver: AsyncDriver,
+    test_id: str,
+    tx: AsyncTransaction
+) -> Dict[str, List]:
+    """Create the test dataset's entities and relationships in tx"""
+    # Create entities
+    entities = make_dataset(test_id)
+
+    entity_result = await create_entities_impl(driver, entities, tx=tx)
+    created_entities = entity_result.result
+
+    # Create relationships
+    relations = [
+        CreateRelationRequest(
+            type=rel_type,
+            from_id=created_entities[from_index].id,
+            to_id=created_entities[to_index].id
+        )
+        for rel_type, from_index, to_index in RELATION_TEMPLATE
+    ]
+
+    relation_result = await create_relations_impl(driver, relations, tx=tx)
+    created_relations = relation_result.result
+
+    return {
+        "entities": created_entities,
+        "relations": created_relations
+    }
+
+
+async def create_schema_test_data(driver: AsyncDriver) -> Dict[str, List]:
+    """Create entities and relations of several types for schema testing
+
+    Args:
+        driver: Neo4j async driver instance
+
+    Returns:
+        Dict containing:
+        - entities: List[Entity] - The created entities
+        - relations: List[Relation] - The created relationships
+    """
+    # Create entities of different types
+    entities = [
+        CreateEntityRequest(
+            type="Person",
+            properties={
+                "name": f"person_{tid()}",
+                "age": 30,
+                "id": f"person_{tid()}"
+            }
+        ),
+        CreateEntityRequest(
+            type="Company",
+            properties={
+                "name": f"company_{tid()}",
+                "founded": 2020,
+                "id": f"company_{tid()}"
+            }
+        ),
+        CreateEntityRequest(
+            type="Product",
+            properties={
+                "name": f"product_{tid()}",
+                "price": 99.99,
+                "id": f"product_{tid()}"
+            }
+        )
+    ]
+    
+    entity_result = await create_entities_impl(driver, entities)
+    created_entities = entity_result.result
+    
+    # Create relations between entities
+    relations = [
+        CreateRelationRequest(
+            type="WORKS_AT",
+            from_id=created_entities[0].id,  # Person
+            to_id=created_entities[1].id     # Company
+        ),
+        CreateRelationRequest(
+            type="PRODUCES",
+            from_id=created_entities[1].id,  # Company
+            to_id=created_entities[2].id     # Product
+        )
+    ]
+    
+    relation_result = await create_relations_impl(driver, relations)
+    
+    return {
+        "entities": created_entities,
+        "relations": relation_result.result
+    }
@@ -0,0 +1,22 @@
+import itertools
+import os
+import secrets
+
+
+# Shared by every id generated in this test session, so everything the
+# session created can be found and removed with a single query. Under
+# pytest-xdist it also names the worker that created the data
+RUN_PREFIX = f"{os.environ.get('PYTEST_XDIST_WORKER', 'main')}-{secrets.token_hex(4)}"
+
+_counter = itertools.count()
+
+
+def tid() -> str:
+    """Return a unique id for test data, tagged with the session prefix
+
+    The prefix makes ids unique across runs, so a counter is enough to keep
+    them unique within one. It is zero-padded so no id is a substring of
+    another, as fuzzy searches for one test's id would otherwise also match
+    data left by later tests (e.g. "-1" inside "-12").
+    """
+    return f"{RUN_PREFIX}-{next(_counter):06d}"
@@ -0,0 +1,75 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _EmptyResult:
+    """Query result with no records, as if nothing in the graph matched"""
+
+    async def single(self) -> None:
+        return None
+
+    async def consume(self) -> None:
+        return None
+
+    def __aiter__(self) -> "_EmptyResult":
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class _EmptyTransaction:
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _EmptyResult:
+        return _EmptyResult()
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+class _EmptySession:
+    async def execute_read(self, work: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        return await work(_EmptyTransaction(), *args, **kwargs)
+
+    execute_write = execute_read
+
+    async def begin_transaction(self, **kwargs: Any) -> _EmptyTransaction:
+        return _EmptyTransaction()
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _EmptyResult:
+        return _EmptyResult()
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "_EmptySession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+class EmptyGraphDriver:
+    """Stand-in for AsyncDriver on which every query matches nothing
+
+    It covers just enough of the driver API for the tools to run against an
+    empty graph, so tests marked unit can run without Neo4j.
+    """
+
+    execute_query_bookmark_manager = None
+
+    def session(self, **kwargs: Any) -> _EmptySession:
+        return _EmptySession()
+
+    async def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        return [], None, []
+
+    async def verify_connectivity(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
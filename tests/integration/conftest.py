@@ -1,25 +1,257 @@
+import asyncio
+import os
+import time
 import pytest
-from typing import AsyncGenerator
-from neo4j import AsyncDriver, AsyncGraphDatabase
+import pytest_asyncio
+from pathlib import Path
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Generator, List
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncSession, AsyncTransaction
+from neo4j.exceptions import ServiceUnavailable
 
+from src.neo4j_driver import ensure_schema
+
+from _fixtures import create_test_dataset, SeededGraph
+from _ids import RUN_PREFIX, tid
+from _stub import EmptyGraphDriver
+
+NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_AUTH = ("neo4j", "password")
+# Connections per driver, i.e. per xdist worker. Raise it for runs that keep
+# many queries in flight at once, e.g. when seeding many datasets
+NEO4J_POOL = int(os.environ.get("NEO4J_POOL", "64"))
+
+# How long a successful connectivity check is trusted by other workers
+CONNECTIVITY_TTL = 60
+
+# With NEO4J_TESTCONTAINER=1 each test session starts its own throwaway
+# Neo4j in Docker instead of using the server at NEO4J_URI
+NEO4J_TESTCONTAINER = os.environ.get("NEO4J_TESTCONTAINER") == "1"
+NEO4J_IMAGE = "neo4j:5.26.0"
+
+# Under pytest-xdist each worker gets its own database, so one worker's
+# cleanup can't wipe data another is using. Serial runs use the default one,
+# as do workers that each have a container of their own.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+NEO4J_DATABASE = f"test-{XDIST_WORKER}" if XDIST_WORKER and not NEO4J_TESTCONTAINER else None
+
+# With NEO4J_UNAVAILABLE=1 only tests marked unit run, against a stub driver
+# on which every query matches nothing
+NEO4J_UNAVAILABLE = os.environ.get("NEO4J_UNAVAILABLE") == "1"
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """Skip the tests that need a real database when Neo4j is unavailable"""
+    if not NEO4J_UNAVAILABLE:
+        return
+    skip = pytest.mark.skip(reason="needs Neo4j, but NEO4J_UNAVAILABLE=1 is set")
+    for item in items:
+        if "unit" not in item.keywords:
+            item.add_marker(skip)
+
+
+def _connectivity_marker(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """File marking that Neo4j was reachable, shared by all workers of a run"""
+    base = tmp_path_factory.getbasetemp()
+    if XDIST_WORKER:
+        # Each worker's basetemp is a subdirectory of the run's
+        base = base.parent
+    return base / "neo4j.ok"
+
+
+def _is_fresh(marker: Path) -> bool:
+    """Whether marker was touched within CONNECTIVITY_TTL seconds"""
+    try:
+        return time.time() - marker.stat().st_mtime < CONNECTIVITY_TTL
+    except FileNotFoundError:
+        return False
+
+
+@pytest.fixture(scope="session")
+def neo4j_uri() -> Generator[str, None, None]:
+    """Bolt URI of the Neo4j server the tests run against
+
+    The container, when NEO4J_TESTCONTAINER=1 asks for one, is started once
+    per session and removed at its end. Only that mode needs testcontainers.
+    """
+    if not NEO4J_TESTCONTAINER or NEO4J_UNAVAILABLE:
+        yield NEO4J_URI
+        return
+
+    try:
+        from testcontainers.neo4j import Neo4jContainer
+    except ImportError:
+        pytest.exit(
+            "NEO4J_TESTCONTAINER=1 needs testcontainers: "
+            "pip install 'testcontainers[neo4j]'",
+            returncode=1
+        )
+
+    container = (
+        Neo4jContainer(NEO4J_IMAGE, password=NEO4J_AUTH[1])
+        .with_env("NEO4J_PLUGINS", '["apoc"]')
+        .with_env("NEO4J_dbms_security_procedures_unrestricted", "apoc.*")
+    )
+    with container:
+        yield container.get_connection_url()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def driver(
+    tmp_path_factory: pytest.TempPathFactory,
+    neo4j_uri: str
+) -> AsyncGenerator[AsyncDriver, None]:
+    """Common fixture providing a Neo4j driver for all integration tests
+
+    The driver is created once per session and shared by every test, so its
+    connection pool is reused instead of reconnecting for each test.
+    """
+    if NEO4J_UNAVAILABLE:
+        yield EmptyGraphDriver()
+        return
 
-@pytest.fixture
-async def driver() -> AsyncGenerator[AsyncDriver, None]:
-    """Common fixture providing a Neo4j driver for all integration tests"""
     driver = AsyncGraphDatabase.driver(
-        "bolt://localhost:7687",
-        auth=("neo4j", "password")
+        neo4j_uri,
+        auth=NEO4J_AUTH,
+        max_connection_pool_size=NEO4J_POOL,
+        connection_acquisition_timeout=30,
+        # Fail fast on a dead server rather than waiting out the OS timeout
+        connection_timeout=5,
+        max_connection_lifetime=3600,
+        # Managed transactions retry transient errors (e.g. deadlocks between
+        # concurrently seeded datasets) for up to this many seconds
+        max_transaction_retry_time=15,
+        # Default database for every session the tools open
+        database=NEO4J_DATABASE
     )
     
     try:
-        await driver.verify_connectivity()
+        # Under xdist the first worker to verify lets the others skip it,
+        # unless each worker has a container of its own to check
+        marker = None if NEO4J_TESTCONTAINER else _connectivity_marker(tmp_path_factory)
+        if marker is None or not _is_fresh(marker):
+            try:
+                await driver.verify_connectivity()
+            except ServiceUnavailable as e:
+                # Stop the whole run instead of failing every test on its own
+                pytest.exit(f"Neo4j is not reachable at {neo4j_uri}: {e}", returncode=1)
+            if marker is not None:
+                marker.touch()
+        if NEO4J_DATABASE:
+            # Multiple databases need Neo4j Enterprise
+            async with driver.session(database="system") as session:
+                result = await session.run(
+                    "CREATE DATABASE $name IF NOT EXISTS WAIT",
+                    {"name": NEO4J_DATABASE}
+                )
+                await result.consume()
         yield driver
     finally:
         await driver.close()
 
 
-@pytest.fixture(autouse=True)
-async def clean_database(driver: AsyncDriver):
-    """Automatically clean the database before each test"""
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def ensure_indexes(driver: AsyncDriver, clean_database: None) -> None:
+    """Create the server's entity id constraint, so lookups by id are index seeks
+
+    Runs after the wipe, since entities with duplicate ids left in the
+    database would keep the constraint from being created. The searches
+    filter on :Entity or on lowered values, so no other index would serve
+    them.
+    """
+    await ensure_schema(driver)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def clean_database(driver: AsyncDriver) -> None:
+    """Start the test session from an empty database
+
+    Tests keep their data apart through unique test ids, so the database is
+    wiped once up front rather than before every test. That also lets
+    session-scoped datasets survive from one test to the next.
+    """
+    await driver.execute_query("MATCH (n) DETACH DELETE n")
+
+
+@pytest_asyncio.fixture(scope="module")
+async def shared_dataset(driver: AsyncDriver, clean_database: None) -> AsyncGenerator[SeededGraph, None]:
+    """The standard test dataset, seeded once per module and shared by its
+    read-only tests
+
+    The dataset is written in a transaction that stays open until the module
+    finishes and is then rolled back, so it never persists. Its connection
+    and locks are released before the next module runs.
+    """
+    async with driver.session() as session:
+        tx = await session.begin_transaction()
+        try:
+            test_id = tid()
+            dataset = await create_test_dataset(driver, test_id, tx=tx)
+            john, jane, corp, project = dataset["entities"]
+            yield SeededGraph(
+                test_id=test_id,
+                john=john,
+                jane=jane,
+                corp=corp,
+                project=project,
+                relations=dataset["relations"],
+                tx=tx
+            )
+        finally:
+            await tx.rollback()
+
+
+@pytest_asyncio.fixture
+async def session(driver: AsyncDriver) -> AsyncGenerator[AsyncSession, None]:
+    """Session shared by every tool call in a test
+
+    Passing it to the tools saves opening a new session per call.
+    """
+    async with driver.session() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def rollback_tx(driver: AsyncDriver) -> AsyncGenerator[AsyncTransaction, None]:
+    """Transaction that is rolled back after the test
+
+    Tests that pass it to the tools leave nothing behind, so their writes
+    never need deleting.
+    """
     async with driver.session() as session:
-        await session.run("MATCH (n) DETACH DELETE n") 
\ No newline at end of file
+        tx = await session.begin_transaction()
+        try:
+            yield tx
+        finally:
+            await tx.rollback()
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def cleanup_test_run(driver: AsyncDriver) -> AsyncGenerator[None, None]:
+    """Remove everything created by this test session once it finishes
+
+    Every test id carries the session prefix, so a single query clears the
+    session's data instead of leaving it behind for the next run.
+    """
+    yield
+    await driver.execute_query(
+        "MATCH (n:Entity) WHERE n.id CONTAINS $prefix DETACH DELETE n",
+        {"prefix": RUN_PREFIX}
+    )
+
+
+@pytest.fixture
+def many_datasets(driver: AsyncDriver) -> Callable[[int], Awaitable[List[Dict[str, List]]]]:
+    """Factory fixture seeding several independent test datasets concurrently
+
+    Each dataset gets its own test_id, so the seeds don't depend on each other
+    and their round-trips can overlap inside a single TaskGroup.
+    """
+    async def _create(n: int) -> List[Dict[str, List]]:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(create_test_dataset(driver, tid()))
+                for _ in range(n)
+            ]
+        return [task.result() for task in tasks]
+
+    return _create
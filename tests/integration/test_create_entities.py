@@ -1,7 +1,5 @@
-import uuid
 from typing import AsyncGenerator
 
-import pytest
 from neo4j import AsyncDriver
 
 from src.tools.create_entities import (
@@ -11,10 +9,12 @@ from src.tools.create_entities import (
     CreateEntitiesResult
 )
 
+from _ids import tid
+
 
 def create_test_entity(name_prefix: str = "test") -> CreateEntityRequest:
     """Create a test entity with a unique ID to avoid conflicts"""
-    unique_id = str(uuid.uuid4())
+    unique_id = tid()
     return CreateEntityRequest(
         type="TestEntity",
         properties={
@@ -23,7 +23,6 @@ def create_test_entity(name_prefix: str = "test") -> CreateEntityRequest:
     )
 
 
-@pytest.mark.asyncio
 async def test_should_create_single_entity(driver: AsyncDriver):
     """When creating a single entity, should create it with all properties"""
     # Arrange
@@ -42,7 +41,6 @@ async def test_should_create_single_entity(driver: AsyncDriver):
     assert created_node.properties["name"] == entity.properties["name"]
 
 
-@pytest.mark.asyncio
 async def test_should_create_multiple_entities(driver: AsyncDriver):
     """When creating multiple entities, should create all with their respective properties"""
     # Arrange
@@ -67,7 +65,6 @@ async def test_should_create_multiple_entities(driver: AsyncDriver):
         assert created_node.properties["name"] == entities[i].properties["name"]
 
 
-@pytest.mark.asyncio
 async def test_should_create_entity_with_custom_type(driver: AsyncDriver):
     """When creating an entity with custom type, should preserve the type"""
     # Arrange
@@ -85,7 +82,6 @@ async def test_should_create_entity_with_custom_type(driver: AsyncDriver):
     assert created_node.properties["name"] == entity.properties["name"]
 
 
-@pytest.mark.asyncio
 async def test_should_handle_duplicate_entity_creation(driver: AsyncDriver):
     """When creating the same entity twice, should handle it idempotently"""
     # Arrange
@@ -112,18 +108,20 @@ async def test_should_handle_duplicate_entity_creation(driver: AsyncDriver):
     assert node1.properties == node2.properties
 
 
-@pytest.mark.asyncio
 async def test_should_persist_entity_in_database(driver: AsyncDriver):
     """When creating an entity, should be able to retrieve it from the database"""
     # Arrange
     entity = create_test_entity()
     
     # Act
-    result = await create_entities_impl(driver, [entity])
+    async with driver.session() as session:
+        result = await create_entities_impl(driver, [entity], session=session)
+        bookmarks = await session.last_bookmarks()
     created_node = result.result[0]
     
-    # Assert - Verify we can retrieve the entity
-    async with driver.session() as session:
+    # Assert - Verify we can retrieve the entity, reading after the write
+    # even if the read goes to a different server
+    async with driver.session(bookmarks=bookmarks) as session:
         query = """
         MATCH (n:Entity {id: $id})
         RETURN {
@@ -142,7 +140,6 @@ async def test_should_persist_entity_in_database(driver: AsyncDriver):
         assert node["properties"]["name"] == entity.properties["name"]
 
 
-@pytest.mark.asyncio
 async def test_should_handle_empty_properties(driver: AsyncDriver):
     """When creating an entity with empty properties, should handle it gracefully"""
     # Arrange
@@ -1,8 +1,6 @@
-import uuid
-from typing import AsyncGenerator, List, Tuple
+from typing import AsyncGenerator, List, Optional, Tuple
 
-import pytest
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncSession
 
 from src.tools.create_entities import create_entities_impl, CreateEntityRequest
 from src.tools.create_relations import (
@@ -12,12 +10,18 @@ from src.tools.create_relations import (
     CreateRelationsResult
 )
 
+from _ids import tid
 
-async def create_test_entities(driver: AsyncDriver, count: int = 2) -> List[str]:
+
+async def create_test_entities(
+    driver: AsyncDriver,
+    count: int = 2,
+    session: Optional[AsyncSession] = None
+) -> List[str]:
     """Create test entities and return their IDs"""
     entities = []
     for i in range(count):
-        unique_id = str(uuid.uuid4())
+        unique_id = tid()
         entities.append(CreateEntityRequest(
             type="TestEntity",
             properties={
@@ -26,15 +30,14 @@ async def create_test_entities(driver: AsyncDriver, count: int = 2) -> List[str]
             }
         ))
     
-    result = await create_entities_impl(driver, entities)
+    result = await create_entities_impl(driver, entities, session=session)
     return [entity.id for entity in result.result]
 
 
-@pytest.mark.asyncio
-async def test_should_create_single_relation(driver: AsyncDriver):
+async def test_should_create_single_relation(driver: AsyncDriver, session: AsyncSession):
     """When creating a single relation, should create it between the specified entities"""
     # Arrange
-    [from_id, to_id] = await create_test_entities(driver, 2)
+    [from_id, to_id] = await create_test_entities(driver, 2, session=session)
     relation = CreateRelationRequest(
         type="TEST_RELATION",
         from_id=from_id,
@@ -42,7 +45,7 @@ async def test_should_create_single_relation(driver: AsyncDriver):
     )
 
     # Act
-    result = await create_relations_impl(driver, [relation])
+    result = await create_relations_impl(driver, [relation], session=session)
 
     # Assert
     assert isinstance(result, CreateRelationsResult)
@@ -54,11 +57,10 @@ async def test_should_create_single_relation(driver: AsyncDriver):
     assert created_relation.to_id == to_id
 
 
-@pytest.mark.asyncio
-async def test_should_create_multiple_relations(driver: AsyncDriver):
+async def test_should_create_multiple_relations(driver: AsyncDriver, session: AsyncSession):
     """When creating multiple relations, should create all with their respective types"""
     # Arrange
-    entity_ids = await create_test_entities(driver, 3)
+    entity_ids = await create_test_entities(driver, 3, session=session)
     relations = [
         CreateRelationRequest(
             type="RELATION_1",
@@ -73,7 +75,7 @@ async def test_should_create_multiple_relations(driver: AsyncDriver):
     ]
 
     # Act
-    result = await create_relations_impl(driver, relations)
+    result = await create_relations_impl(driver, relations, session=session)
 
     # Assert
     assert isinstance(result, CreateRelationsResult)
@@ -87,11 +89,10 @@ async def test_should_create_multiple_relations(driver: AsyncDriver):
         assert created_relation.to_id == relations[i].to_id
 
 
-@pytest.mark.asyncio
-async def test_should_handle_duplicate_relation_creation(driver: AsyncDriver):
+async def test_should_handle_duplicate_relation_creation(driver: AsyncDriver, session: AsyncSession):
     """When creating the same relation twice, should handle it gracefully"""
     # Arrange
-    [from_id, to_id] = await create_test_entities(driver, 2)
+    [from_id, to_id] = await create_test_entities(driver, 2, session=session)
     relation = CreateRelationRequest(
         type="TEST_RELATION",
         from_id=from_id,
@@ -99,8 +100,8 @@ async def test_should_handle_duplicate_relation_creation(driver: AsyncDriver):
     )
     
     # Act - Create the same relation twice
-    result1 = await create_relations_impl(driver, [relation])
-    result2 = await create_relations_impl(driver, [relation])
+    result1 = await create_relations_impl(driver, [relation], session=session)
+    result2 = await create_relations_impl(driver, [relation], session=session)
     
     # Assert - Both operations should succeed
     assert isinstance(result1, CreateRelationsResult)
@@ -119,11 +120,10 @@ async def test_should_handle_duplicate_relation_creation(driver: AsyncDriver):
     assert rel1.to_id == rel2.to_id
 
 
-@pytest.mark.asyncio
-async def test_should_persist_relation_in_database(driver: AsyncDriver):
+async def test_should_persist_relation_in_database(driver: AsyncDriver, session: AsyncSession):
     """When creating a relation, should be able to retrieve it from the database"""
     # Arrange
-    [from_id, to_id] = await create_test_entities(driver, 2)
+    [from_id, to_id] = await create_test_entities(driver, 2, session=session)
     relation = CreateRelationRequest(
         type="TEST_RELATION",
         from_id=from_id,
@@ -131,28 +131,26 @@ async def test_should_persist_relation_in_database(driver: AsyncDriver):
     )
     
     # Act
-    result = await create_relations_impl(driver, [relation])
+    result = await create_relations_impl(driver, [relation], session=session)
     created_relation = result.result[0]
     
     # Assert - Verify we can retrieve the relation
-    async with driver.session() as session:
-        query = """
-        MATCH (a:Entity {id: $from_id})-[r]->(b:Entity {id: $to_id})
-        RETURN type(r) as type, a.id as from_id, b.id as to_id
-        """
-        result = await session.run(query, {
-            "from_id": relation.from_id,
-            "to_id": relation.to_id
-        })
-        record = await result.single()
-        
-        assert record is not None
-        assert record["type"] == relation.type
-        assert record["from_id"] == relation.from_id
-        assert record["to_id"] == relation.to_id
-
-
-@pytest.mark.asyncio
+    query = """
+    MATCH (a:Entity {id: $from_id})-[r]->(b:Entity {id: $to_id})
+    RETURN type(r) as type, a.id as from_id, b.id as to_id
+    """
+    result = await session.run(query, {
+        "from_id": relation.from_id,
+        "to_id": relation.to_id
+    })
+    record = await result.single()
+    
+    assert record is not None
+    assert record["type"] == relation.type
+    assert record["from_id"] == relation.from_id
+    assert record["to_id"] == relation.to_id
+
+
 async def test_should_handle_nonexistent_entities(driver: AsyncDriver):
     """When creating a relation with nonexistent entities, should handle it gracefully"""
     # Arrange
@@ -167,4 +165,4 @@ async def test_should_handle_nonexistent_entities(driver: AsyncDriver):
     
     # Assert
     assert isinstance(result, CreateRelationsResult)
-    assert len(result.result) == 0  # Should return empty result, not error 
\ No newline at end of file
+    assert len(result.result) == 0  # Should return empty result, not error
@@ -1,112 +1,35 @@
-import uuid
-from typing import AsyncGenerator, Dict, List
+from typing import AsyncGenerator
 
-import pytest
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncTransaction
 
 from src.tools.create_entities import create_entities_impl, CreateEntityRequest
-from src.tools.create_relations import create_relations_impl, CreateRelationRequest
 from src.tools.delete_entities import (
     delete_entities_impl,
     DeleteEntityRequest
 )
 
+from _fixtures import create_test_dataset
+from _ids import tid
 
 
-async def create_test_dataset(driver: AsyncDriver, test_id: str) -> Dict[str, List[Dict]]:
-    """Create a test dataset with various entities and relationships
-    
-    Args:
-        driver: Neo4j async driver instance
-        test_id: Unique identifier for this test to ensure data isolation
-        
-    Returns:
-        Dict containing:
-        - entities: List[Dict] - The created entities
-        - relations: List[Dict] - The created relationships
-    """
-    # Create entities
-    entities = [
-        CreateEntityRequest(
-            type="Person",
-            properties={
-                "name": f"John Smith_{test_id}",
-                "age": 30,
-                "email": f"john_{test_id}@example.com"
-            }
-        ),
-        CreateEntityRequest(
-            type="Person",
-            properties={
-                "name": f"Jane Smith_{test_id}",
-                "age": 28,
-                "email": f"jane_{test_id}@example.com"
-            }
-        ),
-        CreateEntityRequest(
-            type="Company",
-            properties={
-                "name": f"Tech Corp_{test_id}",
-                "industry": "Technology"
-            }
-        ),
-        CreateEntityRequest(
-            type="Project",
-            properties={
-                "name": f"Project Alpha_{test_id}",
-                "status": "Active"
-            }
-        )
-    ]
-    
-    entity_result = await create_entities_impl(driver, entities)
-    created_entities = entity_result.result
-    
-    # Create relationships
-    relations = [
-        CreateRelationRequest(
-            type="WORKS_AT",
-            from_id=created_entities[0].id,  # John
-            to_id=created_entities[2].id     # Tech Corp
-        ),
-        CreateRelationRequest(
-            type="WORKS_AT",
-            from_id=created_entities[1].id,  # Jane
-            to_id=created_entities[2].id     # Tech Corp
-        ),
-        CreateRelationRequest(
-            type="MANAGES",
-            from_id=created_entities[0].id,  # John
-            to_id=created_entities[3].id     # Project Alpha
-        )
-    ]
-    
-    relation_result = await create_relations_impl(driver, relations)
-    
-    return {
-        "entities": [e.__dict__ for e in created_entities],
-        "relations": [r.__dict__ for r in relation_result.result]
-    }
-
-
-@pytest.mark.asyncio
-async def test_should_delete_entity_without_relationships(driver: AsyncDriver):
+async def test_should_delete_entity_without_relationships(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When deleting an entity without relationships, should delete it successfully"""
     # Arrange
-    test_id = str(uuid.uuid4())
+    test_id = tid()
     entity = CreateEntityRequest(
         type="TestEntity",
         properties={
             "name": f"Test_{test_id}"
         }
     )
-    result = await create_entities_impl(driver, [entity])
+    result = await create_entities_impl(driver, [entity], tx=rollback_tx)
     entity_id = result.result[0].id
     
     # Act
     delete_result = await delete_entities_impl(
         driver,
-        [DeleteEntityRequest(id=entity_id)]
+        [DeleteEntityRequest(id=entity_id)],
+        tx=rollback_tx
     )
     
     # Assert
@@ -115,18 +38,18 @@ async def test_should_delete_entity_without_relationships(driver: AsyncDriver):
     assert delete_result.deleted_entities[0].id == entity_id
 
 
-@pytest.mark.asyncio
-async def test_should_prevent_deletion_with_relationships(driver: AsyncDriver):
+async def test_should_prevent_deletion_with_relationships(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When deleting an entity with relationships without cascade, should prevent deletion"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    data = await create_test_dataset(driver, test_id)
-    entity_id = data["entities"][0]["id"]  # John Smith has relationships
+    test_id = tid()
+    data = await create_test_dataset(driver, test_id, tx=rollback_tx)
+    entity_id = data["entities"][0].id  # John Smith has relationships
     
     # Act
     delete_result = await delete_entities_impl(
         driver,
-        [DeleteEntityRequest(id=entity_id)]
+        [DeleteEntityRequest(id=entity_id)],
+        tx=rollback_tx
     )
     
     # Assert
@@ -135,18 +58,18 @@ async def test_should_prevent_deletion_with_relationships(driver: AsyncDriver):
     assert "orphaned relationships" in delete_result.errors[0]
 
 
-@pytest.mark.asyncio
-async def test_should_cascade_delete_relationships(driver: AsyncDriver):
+async def test_should_cascade_delete_relationships(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When deleting with cascade=True, should delete entity and its relationships"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    data = await create_test_dataset(driver, test_id)
-    entity_id = data["entities"][0]["id"]  # John Smith has relationships
+    test_id = tid()
+    data = await create_test_dataset(driver, test_id, tx=rollback_tx)
+    entity_id = data["entities"][0].id  # John Smith has relationships
     
     # Act
     delete_result = await delete_entities_impl(
         driver,
-        [DeleteEntityRequest(id=entity_id, cascade=True)]
+        [DeleteEntityRequest(id=entity_id, cascade=True)],
+        tx=rollback_tx
     )
     
     # Assert
@@ -156,19 +79,19 @@ async def test_should_cascade_delete_relationships(driver: AsyncDriver):
     assert len(delete_result.deleted_relationships) > 0
 
 
-@pytest.mark.asyncio
-async def test_should_preview_deletion_impact(driver: AsyncDriver):
+async def test_should_preview_deletion_impact(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When using dry_run=True, should preview deletion impact without making changes"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    data = await create_test_dataset(driver, test_id)
-    entity_id = data["entities"][0]["id"]  # John Smith has relationships
+    test_id = tid()
+    data = await create_test_dataset(driver, test_id, tx=rollback_tx)
+    entity_id = data["entities"][0].id  # John Smith has relationships
     
     # Act
     delete_result = await delete_entities_impl(
         driver,
         [DeleteEntityRequest(id=entity_id, cascade=True)],
-        dry_run=True
+        dry_run=True,
+        tx=rollback_tx
     )
     
     # Assert
@@ -179,28 +102,49 @@ async def test_should_preview_deletion_impact(driver: AsyncDriver):
     assert len(delete_result.deleted_relationships) == 0
 
 
-@pytest.mark.asyncio
-async def test_should_handle_multiple_entity_deletion(driver: AsyncDriver):
+async def test_should_handle_multiple_entity_deletion(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When deleting multiple entities, should handle relationships between them correctly"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    data = await create_test_dataset(driver, test_id)
-    entity_ids = [data["entities"][0]["id"], data["entities"][1]["id"]]  # John and Jane
+    test_id = tid()
+    data = await create_test_dataset(driver, test_id, tx=rollback_tx)
+    entity_ids = [data["entities"][0].id, data["entities"][1].id]  # John and Jane
     
     # Act
     delete_result = await delete_entities_impl(
         driver,
-        [DeleteEntityRequest(id=id, cascade=True) for id in entity_ids]
+        [DeleteEntityRequest(id=id, cascade=True) for id in entity_ids],
+        tx=rollback_tx
     )
     
     # Assert
     assert delete_result.success
-    assert len(delete_result.deleted_entities) == 2
-    assert all(e.id in entity_ids for e in delete_result.deleted_entities)
+    assert {e.id for e in delete_result.deleted_entities} == set(entity_ids)
     assert len(delete_result.deleted_relationships) > 0
 
 
-@pytest.mark.asyncio
+async def test_should_only_delete_requested_entities(driver: AsyncDriver, many_datasets):
+    """When deleting from one dataset, should leave other datasets untouched"""
+    # Arrange
+    target, other = await many_datasets(2)
+    entity_id = target["entities"][0].id  # John Smith has relationships
+    
+    # Act
+    delete_result = await delete_entities_impl(
+        driver,
+        [DeleteEntityRequest(id=entity_id, cascade=True)]
+    )
+    
+    # Assert
+    assert delete_result.success
+    async with driver.session() as session:
+        result = await session.run(
+            "MATCH (n:Entity) WHERE n.id IN $ids RETURN count(n) as remaining",
+            {"ids": [e.id for e in other["entities"]]}
+        )
+        record = await result.single()
+    assert record["remaining"] == len(other["entities"])
+
+
 async def test_should_handle_nonexistent_entities(driver: AsyncDriver):
     """When deleting nonexistent entities, should handle gracefully"""
     # Act
@@ -212,4 +156,4 @@ async def test_should_handle_nonexistent_entities(driver: AsyncDriver):
     # Assert
     assert not delete_result.success
     assert len(delete_result.errors) > 0
-    assert "not found" in delete_result.errors[0] 
\ No newline at end of file
+    assert "not found" in delete_result.errors[0]
@@ -1,89 +1,30 @@
-import uuid
-from typing import AsyncGenerator, Dict, List
+from typing import AsyncGenerator
 
-import pytest
 from neo4j import AsyncDriver
 
 from src.tools.create_entities import create_entities_impl, CreateEntityRequest
-from src.tools.create_relations import create_relations_impl, CreateRelationRequest
 from src.tools.introspect_schema import (
     introspect_schema_impl,
     SchemaIntrospectionResult
 )
+from src.tools.update_entities import update_entities_impl, UpdateEntityRequest
 
+from _fixtures import create_schema_test_data
+from _ids import tid
 
-@pytest.mark.asyncio
-async def test_introspect_empty_database(driver: AsyncDriver):
-    """Test introspecting schema of an empty database"""
-    # Act
-    result = await introspect_schema_impl(driver)
-    
-    # Assert
-    assert isinstance(result, SchemaIntrospectionResult)
-    assert isinstance(result.node_labels, list)
-    assert isinstance(result.relationship_types, list)
-    assert isinstance(result.node_properties, dict)
-    assert isinstance(result.relationship_properties, dict)
+# Property values are parameters so every run reuses the same cached plan
+_HAS_RELATION_CREATE_CYPHER = """
+MATCH (a:Entity {id: $from_id}), (b:Entity {id: $to_id})
+CREATE (a)-[r:HAS_RELATION {since: $since, weight: $weight, active: $active}]->(b)
+"""
 
 
-async def create_test_data(driver: AsyncDriver) -> Dict[str, List[Dict]]:
-    """Create test entities and relations for schema testing"""
-    # Create entities of different types
-    entities = [
-        CreateEntityRequest(
-            type="Person",
-            properties={
-                "name": f"person_{uuid.uuid4()}",
-                "age": 30,
-                "id": f"person_{uuid.uuid4()}"
-            }
-        ),
-        CreateEntityRequest(
-            type="Company",
-            properties={
-                "name": f"company_{uuid.uuid4()}",
-                "founded": 2020,
-                "id": f"company_{uuid.uuid4()}"
-            }
-        ),
-        CreateEntityRequest(
-            type="Product",
-            properties={
-                "name": f"product_{uuid.uuid4()}",
-                "price": 99.99,
-                "id": f"product_{uuid.uuid4()}"
-            }
-        )
-    ]
-    
-    entity_result = await create_entities_impl(driver, entities)
-    created_entities = entity_result.result
-    
-    # Create relations between entities
-    relations = [
-        CreateRelationRequest(
-            type="WORKS_AT",
-            from_id=created_entities[0].id,  # Person
-            to_id=created_entities[1].id     # Company
-        ),
-        CreateRelationRequest(
-            type="PRODUCES",
-            from_id=created_entities[1].id,  # Company
-            to_id=created_entities[2].id     # Product
-        )
-    ]
-    
-    relation_result = await create_relations_impl(driver, relations)
-    
-    return {
-        "entities": [e.__dict__ for e in created_entities],
-        "relations": [r.__dict__ for r in relation_result.result]
-    }
-
+async def test_introspect_result_shape(driver: AsyncDriver):
+    """Test that introspection returns each schema part in its expected type
 
-@pytest.mark.asyncio
-async def test_introspect_empty_database(driver: AsyncDriver):
-    """Test introspecting schema of an empty database"""
+    The database is only wiped once per session, so this holds for whatever
+    earlier tests left behind, empty or not.
+    """
     # Act
     result = await introspect_schema_impl(driver)
     
@@ -95,11 +36,10 @@ async def test_introspect_empty_database(driver: AsyncDriver):
     assert isinstance(result.relationship_properties, dict)
 
 
-@pytest.mark.asyncio
 async def test_introspect_with_data(driver: AsyncDriver):
     """Test introspecting schema after creating test data"""
     # Arrange
-    await create_test_data(driver)
+    await create_schema_test_data(driver)
     
     # Act
     result = await introspect_schema_impl(driver)
@@ -123,20 +63,19 @@ async def test_introspect_with_data(driver: AsyncDriver):
     assert "price" in result.node_properties.get("Product", [])
 
 
-@pytest.mark.asyncio
 async def test_introspect_property_types(driver: AsyncDriver):
     """Test introspecting schema with different property types"""
     # Arrange
     entity = CreateEntityRequest(
         type="TestEntity",
         properties={
-            "name": f"test_{uuid.uuid4()}",
+            "name": f"test_{tid()}",
             "string_prop": "text",
             "int_prop": 42,
             "float_prop": 3.14,
             "bool_prop": True,
             "null_prop": None,
-            "id": f"test_{uuid.uuid4()}"
+            "id": f"test_{tid()}"
         }
     )
     await create_entities_impl(driver, [entity])
@@ -155,7 +94,6 @@ async def test_introspect_property_types(driver: AsyncDriver):
     # Note: null_prop is not expected to be present since Neo4j doesn't store null properties
 
 
-@pytest.mark.asyncio
 async def test_introspect_relationship_properties(driver: AsyncDriver):
     """Test introspecting schema for relationships with properties"""
     # Arrange
@@ -164,8 +102,8 @@ async def test_introspect_relationship_properties(driver: AsyncDriver):
         CreateEntityRequest(
             type="TestEntity",
             properties={
-                "name": f"test_{uuid.uuid4()}",
-                "id": f"test_{uuid.uuid4()}"
+                "name": f"test_{tid()}",
+                "id": f"test_{tid()}"
             }
         ) for _ in range(2)
     ]
@@ -174,18 +112,15 @@ async def test_introspect_relationship_properties(driver: AsyncDriver):
     
     # Create a relationship with properties using Cypher
     async with driver.session() as session:
-        query = """
-        MATCH (a:Entity {id: $from_id}), (b:Entity {id: $to_id})
-        CREATE (a)-[r:HAS_RELATION {
-            since: 2024,
-            weight: 0.5,
-            active: true
-        }]->(b)
-        """
-        await session.run(query, {
-            "from_id": created_entities[0].id,
-            "to_id": created_entities[1].id
-        })
+        await session.execute_write(
+            lambda tx: tx.run(_HAS_RELATION_CREATE_CYPHER, {
+                "from_id": created_entities[0].id,
+                "to_id": created_entities[1].id,
+                "since": 2024,
+                "weight": 0.5,
+                "active": True
+            })
+        )
     
     # Act
     result = await introspect_schema_impl(driver)
@@ -196,4 +131,76 @@ async def test_introspect_relationship_properties(driver: AsyncDriver):
     
     assert "since" in rel_props
     assert "weight" in rel_props
-    assert "active" in rel_props 
\ No newline at end of file
+    assert "active" in rel_props
+
+
+async def test_introspect_reflects_changes_after_cached_call(driver: AsyncDriver):
+    """Test that a cached schema is refreshed once the graph changes"""
+    # Arrange
+    await introspect_schema_impl(driver)
+    entity = CreateEntityRequest(
+        type="CacheCheck",
+        properties={
+            "name": f"cache_{tid()}",
+            "cache_prop": "value"
+        }
+    )
+    await create_entities_impl(driver, [entity])
+    
+    # Act
+    result = await introspect_schema_impl(driver)
+    
+    # Assert
+    assert "CacheCheck" in result.node_labels
+    assert "cache_prop" in result.node_properties.get("CacheCheck", [])
+
+
+async def test_introspect_reflects_property_update_after_cached_call(driver: AsyncDriver):
+    """Test that a cached schema is refreshed by an update that changes no counts"""
+    # Arrange
+    # The source entity registers the property key up front, so the update
+    # below adds no new name to the database either
+    _, target = (await create_entities_impl(driver, [
+        CreateEntityRequest(
+            type="CacheSource",
+            properties={"name": f"cache_{tid()}", "cache_update_prop": "value"}
+        ),
+        CreateEntityRequest(
+            type="CacheUpdate",
+            properties={"name": f"cache_{tid()}"}
+        )
+    ])).result
+    await introspect_schema_impl(driver)
+    await update_entities_impl(driver, [
+        UpdateEntityRequest(id=target.id, properties={"cache_update_prop": "value"})
+    ])
+    
+    # Act
+    result = await introspect_schema_impl(driver)
+    
+    # Assert
+    assert "cache_update_prop" in result.node_properties.get("CacheUpdate", [])
+
+
+async def test_introspect_scan_fallback_matches_schema_procedures(driver: AsyncDriver):
+    """Test that the scanning fallback reports the same schema as the procedures"""
+    # Arrange
+    await create_schema_test_data(driver)
+    
+    # Act
+    procedures_result = await introspect_schema_impl(driver)
+    scan_result = await introspect_schema_impl(driver, use_schema_procedures=False)
+    
+    # Assert
+    assert set(scan_result.node_labels) == set(procedures_result.node_labels)
+    assert set(scan_result.relationship_types) == set(procedures_result.relationship_types)
+    assert {
+        label: set(props) for label, props in scan_result.node_properties.items()
+    } == {
+        label: set(props) for label, props in procedures_result.node_properties.items()
+    }
+    assert {
+        rel_type: set(props) for rel_type, props in scan_result.relationship_properties.items()
+    } == {
+        rel_type: set(props) for rel_type, props in procedures_result.relationship_properties.items()
+    }
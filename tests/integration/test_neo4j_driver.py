@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+from neo4j.exceptions import ClientError, Forbidden
+
+from src.neo4j_driver import (
+    ensure_schema,
+    DROP_ENTITY_ID_INDEX,
+    ENTITY_ID_CONSTRAINT,
+    ENTITY_ID_INDEX
+)
+
+from _stub import EmptyGraphDriver
+
+
+def fake_execute_query(failures: Dict[str, Exception], duplicates: List[str]):
+    """Build an execute_query that raises for the given statements and
+    reports the given duplicated entity ids"""
+    async def execute_query(query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        if query in failures:
+            raise failures[query]
+        if "copies > 1" in query:
+            return [{"ids": duplicates}], None, []
+        return [], None, []
+    return execute_query
+
+
+@pytest.mark.unit
+async def test_should_fall_back_to_index_when_entity_ids_are_duplicated(caplog: pytest.LogCaptureFixture):
+    """When existing entities share ids, should warn with the ids and index them instead"""
+    # Arrange
+    driver = EmptyGraphDriver()
+    execute_query = fake_execute_query(
+        {ENTITY_ID_CONSTRAINT: ClientError("constraint violated")},
+        ["dup_1", "dup_2"]
+    )
+
+    # Act
+    with patch.object(driver, "execute_query", side_effect=execute_query) as mock:
+        created = await ensure_schema(driver)
+
+    # Assert
+    assert not created
+    assert "dup_1, dup_2" in caplog.text
+    assert mock.call_args_list[-1].args[0] == ENTITY_ID_INDEX
+
+
+@pytest.mark.unit
+async def test_should_warn_when_schema_changes_are_forbidden(caplog: pytest.LogCaptureFixture):
+    """When the user may not change the schema, should warn rather than raise"""
+    # Arrange
+    driver = EmptyGraphDriver()
+    forbidden = Forbidden("schema changes not allowed")
+    execute_query = fake_execute_query(
+        {
+            ENTITY_ID_CONSTRAINT: forbidden,
+            ENTITY_ID_INDEX: forbidden,
+            DROP_ENTITY_ID_INDEX: forbidden
+        },
+        []
+    )
+
+    # Act
+    with patch.object(driver, "execute_query", side_effect=execute_query):
+        created = await ensure_schema(driver)
+
+    # Assert
+    assert not created
+    assert "entity_id_unique" in caplog.text
+    assert "entity_id index" in caplog.text
@@ -1,400 +1,156 @@
-import uuid
-from typing import AsyncGenerator, Dict, List
+from typing import Any, Dict, Set
+from unittest.mock import patch
 
 import pytest
 from neo4j import AsyncDriver
 
-from src.tools.create_entities import create_entities_impl, CreateEntityRequest
-from src.tools.create_relations import create_relations_impl, CreateRelationRequest
 from src.tools.search_entities import search_entities_impl, SearchEntityRequest
 
-
-async def create_test_dataset(driver: AsyncDriver, test_id: str) -> Dict[str, List[Dict]]:
-    """Create a test dataset with various entities and relationships
-    
-    Args:
-        driver: Neo4j async driver instance
-        test_id: Unique identifier for this test to ensure data isolation
-    """
-    # Create entities
-    entities = [
-        CreateEntityRequest(
-            type="Person",
-            properties={
-                "name": f"John Smith_{test_id}",
-                "age": 30,
-                "email": f"john_{test_id}@example.com"
-            }
-        ),
-        CreateEntityRequest(
-            type="Person",
-            properties={
-                "name": f"Jane Smith_{test_id}",
-                "age": 28,
-                "email": f"jane_{test_id}@example.com"
-            }
-        ),
-        CreateEntityRequest(
-            type="Company",
-            properties={
-                "name": f"Tech Corp_{test_id}",
-                "industry": "Technology"
-            }
-        ),
-        CreateEntityRequest(
-            type="Project",
-            properties={
-                "name": f"Project Alpha_{test_id}",
-                "status": "Active"
-            }
-        )
-    ]
-    
-    entity_result = await create_entities_impl(driver, entities)
-    created_entities = entity_result.result
-    
-    # Create relationships
-    relations = [
-        CreateRelationRequest(
-            type="WORKS_AT",
-            from_id=created_entities[0].id,  # John
-            to_id=created_entities[2].id     # Tech Corp
-        ),
-        CreateRelationRequest(
-            type="WORKS_AT",
-            from_id=created_entities[1].id,  # Jane
-            to_id=created_entities[2].id     # Tech Corp
-        ),
-        CreateRelationRequest(
-            type="MANAGES",
-            from_id=created_entities[0].id,  # John
-            to_id=created_entities[3].id     # Project Alpha
-        )
-    ]
-    
-    relation_result = await create_relations_impl(driver, relations)
-    created_relations = relation_result.result
-    
+from _fixtures import SeededGraph
+from _ids import tid
+
+
+# Each case is a search against the shared dataset and the names of the
+# entities it should find. "{id}" in a string argument or expected name is
+# replaced with the dataset's test_id.
+CASES = [
+    pytest.param(
+        dict(search_term="John Smith_{id}", fuzzy_match=False),
+        {"John Smith_{id}"},
+        id="exact_name_match"
+    ),
+    pytest.param(
+        dict(search_term="Smith_{id}", fuzzy_match=True),
+        {"John Smith_{id}", "Jane Smith_{id}"},
+        id="fuzzy_name_match"
+    ),
+    pytest.param(
+        dict(search_term="{id}", entity_type="Person", fuzzy_match=True),
+        {"John Smith_{id}", "Jane Smith_{id}"},
+        id="filter_by_type"
+    ),
+    pytest.param(
+        dict(search_term="john_{id}@example.com", properties=["email"]),
+        {"John Smith_{id}"},
+        id="property_value"
+    ),
+    pytest.param(
+        dict(search_term="john smith_{id}", fuzzy_match=True),
+        {"John Smith_{id}"},
+        id="case_insensitive"
+    ),
+    pytest.param(
+        dict(search_term="Tech Corp_{id}", properties=["name"], fuzzy_match=False),
+        {"Tech Corp_{id}"},
+        id="exact_name_property"
+    ),
+    pytest.param(
+        dict(search_term="{id}", entity_type="Company", properties=["name"]),
+        {"Tech Corp_{id}"},
+        id="type_and_property"
+    ),
+    pytest.param(
+        dict(search_term="{id}", properties=["email"], fuzzy_match=True),
+        {"John Smith_{id}", "Jane Smith_{id}"},
+        id="property_with_email"
+    ),
+    pytest.param(
+        dict(search_term="{id}", entity_type="Person", properties=["email"]),
+        {"John Smith_{id}", "Jane Smith_{id}"},
+        id="combined_type_and_property_filters"
+    ),
+]
+
+
+def _format_args(args: Dict[str, Any], test_id: str) -> Dict[str, Any]:
+    """Fill in the test_id placeholder of a case's string arguments"""
     return {
-        "entities": created_entities,
-        "relations": created_relations
+        key: value.format(id=test_id) if isinstance(value, str) else value
+        for key, value in args.items()
     }
 
 
-@pytest.mark.asyncio
-async def test_should_find_entity_by_exact_name_match(driver: AsyncDriver):
-    """When searching with exact name match, should return only the matching entity"""
+@pytest.mark.parametrize("args, expected_names", CASES)
+async def test_search_cases(
+    driver: AsyncDriver,
+    shared_dataset: SeededGraph,
+    args: Dict[str, Any],
+    expected_names: Set[str]
+):
+    """When searching the shared dataset, should return exactly the expected entities"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=f"John Smith_{test_id}",
-            fuzzy_match=False
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 1
-    assert result.results[0].properties["name"] == f"John Smith_{test_id}"
-
+    test_id = shared_dataset.test_id
 
-@pytest.mark.asyncio
-async def test_should_find_multiple_entities_with_fuzzy_name_match(driver: AsyncDriver):
-    """When searching with fuzzy name match, should return all partially matching entities"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
     # Act
     result = await search_entities_impl(
         driver,
-        SearchEntityRequest(
-            search_term=f"Smith_{test_id}",
-            fuzzy_match=True
-        )
+        SearchEntityRequest(**_format_args(args, test_id)),
+        tx=shared_dataset.tx
     )
-    
-    # Assert
-    assert len(result.results) == 2
-    assert all("Smith" in entity.properties["name"] for entity in result.results)
 
-
-@pytest.mark.asyncio
-async def test_should_filter_entities_by_type(driver: AsyncDriver):
-    """When filtering by entity type, should return only entities of that type"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=test_id,
-            entity_type="Person",
-            fuzzy_match=True
-        )
-    )
-    
     # Assert
-    assert len(result.results) == 2
-    assert all("Person" in entity.type for entity in result.results)
+    names = [entity.properties["name"] for entity in result.results]
+    assert len(names) == len(expected_names)
+    assert set(names) == {name.format(id=test_id) for name in expected_names}
 
 
-@pytest.mark.asyncio
-async def test_should_find_entity_by_property_value(driver: AsyncDriver):
-    """When searching by specific property value, should return matching entity"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
+@pytest.mark.unit
+async def test_should_return_empty_results_for_nonexistent_entity(driver: AsyncDriver):
+    """When searching for a term no entity has, should return no results"""
     # Act
+    # A fresh id can't match anything, so this needs no dataset at all
     result = await search_entities_impl(
         driver,
-        SearchEntityRequest(
-            search_term=f"john_{test_id}@example.com",
-            properties=["email"]
-        )
+        SearchEntityRequest(search_term=f"NonexistentPerson_{tid()}")
     )
-    
+
     # Assert
-    assert len(result.results) == 1
-    assert result.results[0].properties["email"] == f"john_{test_id}@example.com"
+    assert result.results == []
 
 
-@pytest.mark.asyncio
-async def test_should_include_relationships_when_requested(driver: AsyncDriver):
+async def test_should_include_relationships_when_requested(driver: AsyncDriver, shared_dataset: SeededGraph):
     """When relationships are included, should return entity with its relationships"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
+    john = shared_dataset.john
+
     # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=f"John Smith_{test_id}",
-            include_relationships=True
+    # Watch the queries sent, to catch relationships being fetched per node
+    with patch.object(shared_dataset.tx, "run", wraps=shared_dataset.tx.run) as run:
+        result = await search_entities_impl(
+            driver,
+            SearchEntityRequest(
+                search_term=john.properties["name"],
+                include_relationships=True
+            ),
+            tx=shared_dataset.tx
         )
-    )
-    
+
     # Assert
+    assert run.call_count == 1
     assert len(result.results) == 1
     entity = result.results[0]
-    assert entity.properties["name"] == f"John Smith_{test_id}"
+    assert entity.id == john.id
     assert len(entity.relationships) == 2
     assert any(rel["type"] == "WORKS_AT" for rel in entity.relationships)
     assert any(rel["type"] == "MANAGES" for rel in entity.relationships)
 
 
-@pytest.mark.asyncio
-async def test_should_return_empty_results_for_nonexistent_entity(driver: AsyncDriver):
-    """When searching for nonexistent entity, should return empty results"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=f"NonexistentPerson_{test_id}"
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 0
-
-
-@pytest.mark.asyncio
-async def test_should_match_case_insensitively(driver: AsyncDriver):
-    """When searching with different case, should match case-insensitively"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=f"john smith_{test_id}",  # lowercase
-            fuzzy_match=True
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 1
-    assert result.results[0].properties["name"] == f"John Smith_{test_id}"
-
-
-@pytest.mark.asyncio
-async def test_should_find_entity_by_exact_name(driver: AsyncDriver):
-    """When searching for entity by exact name, should return matching entity with properties"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    await create_test_dataset(driver, test_id)
-
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=f"Tech Corp_{test_id}",
-            properties=["name"],
-            fuzzy_match=False
-        )
-    )
-
-    # Assert
-    assert len(result.results) == 1
-    assert result.results[0].properties["name"] == f"Tech Corp_{test_id}"
-    assert "Company" in result.results[0].type
-
-
-@pytest.mark.asyncio
-async def test_should_find_entity_by_type_and_property(driver: AsyncDriver):
-    """When searching by type and property value, should return matching entity"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
-    # Act
-    results = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=test_id,
-            entity_type="Company",
-            properties=["name"]
-        )
-    )
-    
-    # Assert
-    assert len(results.results) == 1
-    assert "Company" in results.results[0].type
-    assert test_id in results.results[0].properties["name"]
-
-
-@pytest.mark.asyncio
-async def test_should_find_all_entities_of_type_without_search_term(driver: AsyncDriver):
-    """When only entity type is provided, should return all entities of that type"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            entity_type="Person",
-            search_term=test_id,
-            fuzzy_match=True
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 2
-    assert all("Person" in entity.type for entity in result.results)
-    assert any(f"John Smith_{test_id}" in entity.properties["name"] for entity in result.results)
-    assert any(f"Jane Smith_{test_id}" in entity.properties["name"] for entity in result.results)
-
-
-@pytest.mark.asyncio
-async def test_should_find_entities_with_property_without_search_term(driver: AsyncDriver):
-    """When only property names are provided, should return entities having those properties"""
+async def test_should_return_all_entities_without_filters(driver: AsyncDriver, shared_dataset: SeededGraph):
+    """When no search term, type, or properties are provided, should return all entities"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            properties=["email"],
-            search_term=test_id,
-            fuzzy_match=True
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 2  # Both Person entities have email
-    assert all("email" in entity.properties for entity in result.results)
-    assert any(f"john_{test_id}@example.com" in entity.properties["email"] for entity in result.results)
-    assert any(f"jane_{test_id}@example.com" in entity.properties["email"] for entity in result.results)
-
+    suffix = f"_{shared_dataset.test_id}"
 
-@pytest.mark.asyncio
-async def test_should_find_entities_by_type_and_property_without_search_term(driver: AsyncDriver):
-    """When entity type and property names are provided without search term, should filter accordingly"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
     # Act
     result = await search_entities_impl(
         driver,
-        SearchEntityRequest(
-            entity_type="Company",
-            properties=["name"],
-            search_term=test_id,
-            fuzzy_match=True
-        )
+        SearchEntityRequest(),
+        tx=shared_dataset.tx
     )
-    
-    # Assert
-    assert len(result.results) == 1
-    assert "Company" in result.results[0].type
-    assert "name" in result.results[0].properties
-    assert test_id in result.results[0].properties["name"]
 
-
-@pytest.mark.asyncio
-async def test_should_return_all_entities_without_filters(driver: AsyncDriver):
-    """When no search term, type, or properties are provided, should return all entities"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest()
-    )
-    
     # Assert
     # Should find at least our 4 test entities (there might be others in the DB)
-    test_entities = [entity for entity in result.results 
-                    if any(test_id in str(value) 
-                          for value in entity.properties.values() 
-                          if isinstance(value, str))]
-    assert len(test_entities) == 4
-    assert any("Person" in entity.type and f"John Smith_{test_id}" in entity.properties["name"] 
-              for entity in test_entities)
-    assert any("Company" in entity.type and f"Tech Corp_{test_id}" in entity.properties["name"] 
-              for entity in test_entities)
-
-
-@pytest.mark.asyncio
-async def test_should_combine_type_and_property_filters(driver: AsyncDriver):
-    """When combining entity type and property filters with search term, should apply all filters"""
-    # Arrange
-    test_id = str(uuid.uuid4())
-    dataset = await create_test_dataset(driver, test_id)
-    
-    # Act
-    result = await search_entities_impl(
-        driver,
-        SearchEntityRequest(
-            search_term=test_id,
-            entity_type="Person",
-            properties=["email"]
-        )
-    )
-    
-    # Assert
-    assert len(result.results) == 2
-    assert all("Person" in entity.type for entity in result.results)
-    assert all("email" in entity.properties for entity in result.results)
-    assert all(test_id in entity.properties["email"] for entity in result.results) 
\ No newline at end of file
+    by_name = {entity.properties.get("name"): entity for entity in result.results}
+    test_names = {name for name in by_name if name and name.endswith(suffix)}
+    assert len(test_names) == 4
+    assert "Person" in by_name[shared_dataset.john.properties["name"]].type
+    assert "Company" in by_name[shared_dataset.corp.properties["name"]].type
@@ -1,47 +1,63 @@
-import uuid
-from typing import AsyncGenerator, Dict, List
+from typing import AsyncGenerator, List, Optional
 
 import pytest
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncTransaction
 
-from src.tools.create_entities import create_entities_impl, CreateEntityRequest
+from src.tools.create_entities import create_entities_impl, CreateEntityRequest, Entity
 from src.tools.update_entities import (
     update_entities_impl,
     UpdateEntityRequest
 )
 
+from _ids import tid
+
+
+async def create_test_entities(
+    driver: AsyncDriver,
+    test_ids: List[str],
+    tx: Optional[AsyncTransaction] = None
+) -> List[Entity]:
+    """Create one test entity per test_id for update tests, in a single call"""
+    entities = [
+        CreateEntityRequest(
+            type="TestEntity",
+            properties={
+                "name": f"Test_{test_id}",
+                "count": 1,
+                "tags": ["test", "initial"]
+            }
+        )
+        for test_id in test_ids
+    ]
+    
+    result = await create_entities_impl(driver, entities, tx=tx)
+    return result.result
 
-async def create_test_entity(driver: AsyncDriver, test_id: str) -> Dict:
+
+async def create_test_entity(
+    driver: AsyncDriver,
+    test_id: str,
+    tx: Optional[AsyncTransaction] = None
+) -> Entity:
     """Create a test entity for update tests"""
-    entity = CreateEntityRequest(
-        type="TestEntity",
-        properties={
-            "name": f"Test_{test_id}",
-            "count": 1,
-            "tags": ["test", "initial"]
-        }
-    )
-    
-    result = await create_entities_impl(driver, [entity])
-    return result.result[0].__dict__
+    return (await create_test_entities(driver, [test_id], tx=tx))[0]
 
 
-@pytest.mark.asyncio
-async def test_should_update_entity_properties(driver: AsyncDriver):
+async def test_should_update_entity_properties(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When updating entity properties, should modify existing and add new ones"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity = await create_test_entity(driver, test_id)
+    test_id = tid()
+    entity = await create_test_entity(driver, test_id, tx=rollback_tx)
     
     # Act
     update = UpdateEntityRequest(
-        id=entity["id"],
+        id=entity.id,
         properties={
             "count": 2,  # Modify existing
             "description": "New property"  # Add new
         }
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert result.success
@@ -52,19 +68,18 @@ async def test_should_update_entity_properties(driver: AsyncDriver):
     assert updated.properties["name"] == f"Test_{test_id}"  # Unchanged
 
 
-@pytest.mark.asyncio
-async def test_should_remove_entity_properties(driver: AsyncDriver):
+async def test_should_remove_entity_properties(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When removing properties, should remove them from the entity"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity = await create_test_entity(driver, test_id)
+    test_id = tid()
+    entity = await create_test_entity(driver, test_id, tx=rollback_tx)
     
     # Act
     update = UpdateEntityRequest(
-        id=entity["id"],
+        id=entity.id,
         remove_properties=["count", "tags"]
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert result.success
@@ -75,19 +90,18 @@ async def test_should_remove_entity_properties(driver: AsyncDriver):
     assert "name" in updated.properties  # Unchanged
 
 
-@pytest.mark.asyncio
-async def test_should_add_entity_labels(driver: AsyncDriver):
+async def test_should_add_entity_labels(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When adding labels, should append them to entity's type list"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity = await create_test_entity(driver, test_id)
+    test_id = tid()
+    entity = await create_test_entity(driver, test_id, tx=rollback_tx)
     
     # Act
     update = UpdateEntityRequest(
-        id=entity["id"],
+        id=entity.id,
         add_labels=["NewLabel", "AnotherLabel"]
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert result.success
@@ -98,25 +112,24 @@ async def test_should_add_entity_labels(driver: AsyncDriver):
     assert "TestEntity" in updated.type  # Original label remains
 
 
-@pytest.mark.asyncio
-async def test_should_remove_entity_labels(driver: AsyncDriver):
+async def test_should_remove_entity_labels(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When removing labels, should remove them from entity's type list"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity = await create_test_entity(driver, test_id)
-    
-    # First add some labels to remove
-    await update_entities_impl(
-        driver,
-        [UpdateEntityRequest(id=entity["id"], add_labels=["ToRemove1", "ToRemove2", "ToKeep"])]
-    )
+    entity_id = f"Test_{tid()}"
+    # Create the entity already carrying the labels to remove, rather than
+    # adding them with a separate update first
+    await (await rollback_tx.run(
+        "CREATE (n:Entity:TestEntity:ToRemove1:ToRemove2:ToKeep "
+        "{id: $id, name: $id, type: 'TestEntity'})",
+        {"id": entity_id}
+    )).consume()
     
     # Act
     update = UpdateEntityRequest(
-        id=entity["id"],
+        id=entity_id,
         remove_labels=["ToRemove1", "ToRemove2"]
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert result.success
@@ -128,42 +141,49 @@ async def test_should_remove_entity_labels(driver: AsyncDriver):
     assert "TestEntity" in updated.type
 
 
-@pytest.mark.asyncio
-async def test_should_handle_batch_updates(driver: AsyncDriver):
+async def test_should_handle_batch_updates(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When updating multiple entities, should process all updates"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity1 = await create_test_entity(driver, f"{test_id}_1")
-    entity2 = await create_test_entity(driver, f"{test_id}_2")
+    test_id = tid()
+    # Both share rollback_tx, so they are created in one batch rather than
+    # concurrently
+    entity1, entity2 = await create_test_entities(
+        driver, [f"{test_id}_1", f"{test_id}_2"], tx=rollback_tx
+    )
     
     # Act
     updates = [
         UpdateEntityRequest(
-            id=entity1["id"],
+            id=entity1.id,
             properties={"status": "updated"}
         ),
         UpdateEntityRequest(
-            id=entity2["id"],
+            id=entity2.id,
             properties={"status": "updated"}
         )
     ]
-    result = await update_entities_impl(driver, updates)
+    result = await update_entities_impl(driver, updates, tx=rollback_tx)
     
     # Assert
     assert result.success
     assert len(result.updated_entities) == 2
-    assert all(e.properties["status"] == "updated" for e in result.updated_entities)
+    # Count the stored updates server-side rather than re-checking each result
+    record = await (await rollback_tx.run(
+        "MATCH (n:Entity) WHERE n.id IN $ids AND n.status = 'updated' RETURN count(n) AS updated",
+        ids=[entity1.id, entity2.id]
+    )).single()
+    assert record["updated"] == len(result.updated_entities)
 
 
-@pytest.mark.asyncio
-async def test_should_handle_nonexistent_entity(driver: AsyncDriver):
+@pytest.mark.unit
+async def test_should_handle_nonexistent_entity(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When updating nonexistent entity, should return error"""
     # Act
     update = UpdateEntityRequest(
         id="nonexistent",
         properties={"test": "value"}
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert not result.success
@@ -172,22 +192,21 @@ async def test_should_handle_nonexistent_entity(driver: AsyncDriver):
     assert "not found" in result.errors[0]
 
 
-@pytest.mark.asyncio
-async def test_should_handle_combined_updates(driver: AsyncDriver):
+async def test_should_handle_combined_updates(driver: AsyncDriver, rollback_tx: AsyncTransaction):
     """When combining different types of updates, should apply all changes"""
     # Arrange
-    test_id = str(uuid.uuid4())
-    entity = await create_test_entity(driver, test_id)
+    test_id = tid()
+    entity = await create_test_entity(driver, test_id, tx=rollback_tx)
     
     # Act
     update = UpdateEntityRequest(
-        id=entity["id"],
+        id=entity.id,
         properties={"status": "active"},
         remove_properties=["count"],
         add_labels=["Active"],
         remove_labels=["TestEntity"]
     )
-    result = await update_entities_impl(driver, [update])
+    result = await update_entities_impl(driver, [update], tx=rollback_tx)
     
     # Assert
     assert result.success